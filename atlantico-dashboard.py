@@ -0,0 +1,4 @@
+from atlantico.app import executar
+
+# Todas as análises em um único app
+executar()
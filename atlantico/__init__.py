@@ -0,0 +1 @@
+"""Rotinas compartilhadas pelos dashboards atlantico-analise*."""
@@ -0,0 +1,79 @@
+"""Agregações acumuladas bloco a bloco (contagem, soma e média por chave)."""
+
+import pandas as pd
+
+from atlantico.blocos import TAMANHO_BLOCO, ler_em_blocos
+
+
+class AgregadorIncremental:
+    """Acumula, por valor de `chave`, o total de linhas e a soma de `valor`.
+
+    Com `multivalorado=True` a chave é uma lista separada por vírgulas
+    (como "Para" e "Equipe") e cada linha conta para cada item da lista.
+    Linhas já contadas podem ser retiradas com `remover`.
+    """
+
+    def __init__(self, chave, valor=None, multivalorado=False):
+        self.chave = chave
+        self.valor = valor
+        self.multivalorado = multivalorado
+        self._total = pd.Series(dtype="int64")
+        self._n = pd.Series(dtype="int64")
+        self._soma = pd.Series(dtype="float64")
+
+    @property
+    def colunas(self):
+        return [c for c in (self.chave, self.valor) if c is not None]
+
+    def _chaves(self, bloco):
+        if not self.multivalorado:
+            # Categorias diferem entre blocos; a chave acumulada é texto
+            return bloco.assign(**{self.chave: bloco[self.chave].astype(object)})
+        itens = bloco[self.chave].dropna().astype(str).str.split(",").explode().str.strip()
+        itens = itens[itens != ""]
+        return bloco.loc[itens.index].assign(**{self.chave: itens.to_numpy()})
+
+    def atualizar(self, bloco, sinal=1):
+        if self.chave not in bloco.columns or bloco.empty:
+            return
+        somar = self.valor is not None and self.valor in bloco.columns
+        if somar:
+            # Soma em float64: a coluna tipada (float32) acumularia erro já no 2º decimal
+            bloco = bloco.assign(**{self.valor: bloco[self.valor].astype("float64")})
+        grupos = self._chaves(bloco).groupby(self.chave)
+        self._total = self._total.add(sinal * grupos.size(), fill_value=0).astype("int64")
+        if somar:
+            valores = grupos[self.valor]
+            self._n = self._n.add(sinal * valores.count(), fill_value=0).astype("int64")
+            self._soma = self._soma.add(sinal * valores.sum(), fill_value=0)
+        if sinal < 0:
+            self._total = self._total[self._total > 0]
+
+    def remover(self, bloco):
+        """Desfaz a contribuição de linhas passadas antes a `atualizar`."""
+        self.atualizar(bloco, sinal=-1)
+
+    def resultado(self):
+        """DataFrame indexado pela chave com total, n, soma e média."""
+        df = pd.DataFrame({"total": self._total})
+        df.index.name = self.chave
+        if self.valor is not None:
+            df["n"] = self._n.reindex(df.index, fill_value=0)
+            # Sem valores restantes a soma volta a zero (e não a um resíduo)
+            df["soma"] = self._soma.reindex(df.index, fill_value=0.0).where(df["n"] > 0, 0.0)
+            df["media"] = df["soma"] / df["n"].where(df["n"] > 0)
+        return df
+
+
+def agregar_planilha(dados, agregadores, tamanho_bloco=TAMANHO_BLOCO):
+    """Percorre o arquivo uma única vez alimentando todos os agregadores.
+
+    Devolve (resultados, linhas lidas); só um bloco fica em memória por vez.
+    """
+    colunas = sorted({c for agregador in agregadores for c in agregador.colunas})
+    linhas = 0
+    for bloco in ler_em_blocos(dados, colunas, tamanho_bloco):
+        linhas += len(bloco)
+        for agregador in agregadores:
+            agregador.atualizar(bloco)
+    return [agregador.resultado() for agregador in agregadores], linhas
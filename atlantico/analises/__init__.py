@@ -0,0 +1,52 @@
+"""Registro das análises exibidas pelo dashboard.
+
+Cada análise é um módulo com a função `exibir(df, chave)` (dashboard) e a
+função `relatorio(df, frequencia)`, que devolve as `Secao`s do relatório
+em lote (ver atlantico.relatorio). O registro guarda apenas o caminho do
+módulo e as colunas usadas: o módulo só é importado quando o botão da
+análise é ativado na sidebar, e o app lê de uma vez a união das colunas de
+todas as análises registradas.
+"""
+
+import importlib
+from collections import namedtuple
+
+Analise = namedtuple("Analise", ["rotulo", "modulo", "colunas"])
+# Parte do relatório em lote: tabela agregada e o gráfico dela (ou None)
+Secao = namedtuple("Secao", ["nome", "titulo", "tabela", "figura"])
+
+ANALISES = {}
+
+
+def registrar(nome, rotulo, modulo, colunas):
+    ANALISES[nome] = Analise(rotulo, modulo, list(colunas))
+
+
+def carregar(nome):
+    return importlib.import_module(ANALISES[nome].modulo)
+
+
+def colunas(nomes):
+    """União das colunas das análises, sem repetir e na ordem de registro."""
+    return list(dict.fromkeys(c for nome in nomes for c in ANALISES[nome].colunas))
+
+
+registrar(
+    "reabertas", "🔁 Análise Reabertas", "atlantico.analises.reabertas",
+    ["Tarefa", "Para", "Reaberta?"],
+)
+registrar(
+    "tempo", "Tempo de Entrega", "atlantico.analises.tempo",
+    ["ID da Tarefa", "Tarefa", "Equipe", "Entrega desejada", "Fechada em"],
+)
+registrar(
+    "percentual", "Esforço Percentual (%)", "atlantico.analises.percentual",
+    [
+        "ID da Tarefa", "Tarefa", "Tipo de tarefa", "Esforço estimado h",
+        "Já registradas h", "%", "Entrega desejada", "Fechada em",
+    ],
+)
+registrar(
+    "tempo_tarefa", "Tempo por Tipo de Tarefa", "atlantico.analises.tempo_tarefa",
+    ["ID da Tarefa", "Tarefa", "Tipo de tarefa", "Já registradas h"],
+)
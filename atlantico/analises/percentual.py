@@ -0,0 +1,154 @@
+"""Esforço estimado x tempo lançado (coluna %)."""
+
+import streamlit as st
+import numpy as np
+
+from atlantico import armazem
+from atlantico.analises import Secao
+from atlantico.plano import HORAS, PERCENTUAL, Plano
+from atlantico.resultados import memorizar
+from atlantico.tabela import tabela_paginada
+
+
+# Campos convertidos para número; válidos = horas lançadas e % preenchido
+PLANO_VALIDOS = (
+    Plano()
+    .derivar(HORAS)
+    .derivar(PERCENTUAL)
+    .filtrar(["Já registradas h", "%"], lambda c: (c["Já registradas h"] > 0) & c["%"].notna())
+)
+
+
+def registros_validos(df, chave=None):
+    return PLANO_VALIDOS.executar(df, chave)
+
+
+def percentuais_ate(df_val, limite):
+    """Registros com % até `limite` (em pontos percentuais), do menor ao maior."""
+    # Mesma precisão da coluna (float32), senão 20% ficaria acima de 0.2
+    df_menor = df_val[df_val["%"] <= np.float32(limite/100) ]
+
+    colunas_mostrar = [
+        "ID da Tarefa",
+        "Tarefa",
+        "Tipo de tarefa",
+        "Esforço estimado h",
+        "Já registradas h",
+        "%",
+        "Entrega desejada",
+        "Fechada em"
+        ]
+    colunas_mostrar = [c for c in colunas_mostrar if c in df_menor.columns]
+
+    return df_menor[colunas_mostrar].sort_values("%").reset_index(drop=True)
+
+
+# Filtros de registros_validos + percentuais_ate/acima_de_100 feitos no
+# banco; só as linhas encontradas saem do DataFrame
+SQL_LINHAS = """
+    SELECT linha
+    FROM tarefas
+    WHERE arquivo = ? AND registradas_h > 0 AND percentual IS NOT NULL AND {filtro}
+    ORDER BY linha
+"""
+
+
+def linhas_sql(df, chave, filtro, parametros=()):
+    linhas = armazem.consultar(SQL_LINHAS.format(filtro=filtro), (chave, *parametros))["linha"]
+    return df.loc[linhas.to_numpy()]
+
+
+def percentuais_acima_de_100(df_val):
+    df_maior = df_val[df_val["%"] > 1]   # 1 = 100%
+
+    # 👇 MANTER a coluna '%' para permitir ordenação
+    colunas_mostrar = [
+        "ID da Tarefa",
+        "Tarefa",
+        "Tipo de tarefa",
+        "Esforço estimado h",
+        "Já registradas h",
+        "%",                # MANTÉM para ordenação
+        "%(percentual)",    # exibe formatado ao usuário
+        "Entrega desejada",
+        "Fechada em"
+    ]
+
+    # remover colunas que não existem
+    colunas_mostrar = [c for c in colunas_mostrar if c in df_maior.columns or c == "%(percentual)"]
+
+    # 👉 Criar coluna formatada, direto na tabela exibida (sem copiar df_maior)
+    df_view = df_maior.reindex(columns=colunas_mostrar)
+    df_view["%(percentual)"] = (df_maior["%"].astype("float64") * 100).round(2).astype(str) + "%"
+
+    # 👇 ordenar pela coluna original: '%'
+    df_view = df_view.sort_values("%", ascending=False)
+    return df_view.reset_index(drop=True)
+
+
+# ======================================================
+# ANÁLISE 5 — Percentuais (%)
+# ======================================================
+def exibir(df, chave):
+
+    st.markdown("## 📉 Análise Esforço Estimado x Tempo lançado (%)")
+
+    # Garantir que a coluna existe
+    if "%" not in df.columns:
+        st.error("A coluna '%' não existe no arquivo.")
+        st.stop()
+
+    no_banco = armazem.contem(chave)
+    if not no_banco:
+        df_val = memorizar(chave, "percentual.validos", (), lambda: registros_validos(df, chave))
+
+    # ======================================================
+    # 1️⃣ PRIMEIRO DATAFRAME — Filtrar pelo slider
+    # ======================================================
+    st.markdown("### 🔽 1) Percentuais menores ou iguais que o valor escolhido")
+
+    limite = st.slider(
+        "Escolha o limite máximo (%)",
+        min_value=10,
+        max_value=60,
+        step=10,
+        value=20
+    )
+
+    df_menor = memorizar(
+        chave, "percentual.menor", (limite,),
+        lambda: percentuais_ate(
+            linhas_sql(df, chave, "percentual <= ?", (float(np.float32(limite/100)),)) if no_banco else df_val,
+            limite,
+        ),
+    )
+
+    st.markdown(f"#### Valores com **% < {limite}**")
+    if df_menor.empty:
+        st.info("Nenhum registro encontrado com esse filtro.")
+    else:
+        tabela_paginada(df_menor, chave, "percentual.menor", (limite,))
+
+    # ======================================================
+    # 2️⃣ SEGUNDO DATAFRAME — Valores maiores que 100
+    # ======================================================
+    st.markdown("### 🔼 2) Percentuais maiores que 100% (fixo)")
+
+    df_maior = memorizar(
+        chave, "percentual.maior", (),
+        lambda: percentuais_acima_de_100(linhas_sql(df, chave, "percentual > 1") if no_banco else df_val),
+    )
+
+    if df_maior.empty:
+        st.info("Nenhum registro encontrado com % acima de 100%.")
+    else:
+        tabela_paginada(df_maior, chave, "percentual.maior")
+
+
+def relatorio(df, frequencia, limite=20):
+    """Seções do relatório em lote (tabelas, sem gráficos; limite padrão do slider)."""
+    df_val = registros_validos(df)
+    return [
+        Secao("menor", f"Percentuais até {limite}%", percentuais_ate(df_val, limite), None),
+        Secao("maior", "Percentuais acima de 100%", percentuais_acima_de_100(df_val), None),
+    ]
@@ -0,0 +1,222 @@
+"""Análise de tarefas reabertas: proporção Sim/Não e reaberturas por responsável."""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from atlantico import armazem
+from atlantico.cubos import GRANULARIDADES, Cubo, detalhar, escolher_granularidade
+from atlantico.esquema import sim_nao
+from atlantico.figuras import exibir_figura
+from atlantico.analises import Secao
+from atlantico.indice import IndiceAtribuicao, tabela_indexada
+from atlantico.plano import Plano
+from atlantico.resultados import memorizar
+from atlantico.tabela import tabela_paginada
+
+
+def contagem_reaberta(df):
+    cont = sim_nao(df["Reaberta?"]).value_counts().reset_index()
+    cont.columns = ["Reaberta", "Total"]
+    return cont
+
+
+SQL_CONTAGEM = """
+    SELECT reaberta, COUNT(*) AS total
+    FROM tarefas
+    WHERE arquivo = ? AND reaberta IS NOT NULL
+    GROUP BY reaberta
+"""
+
+
+def contagem_reaberta_sql(chave):
+    linhas = armazem.consultar(SQL_CONTAGEM, (chave,))
+    cont = (
+        pd.Series(linhas["total"].to_numpy(), index=sim_nao(linhas["reaberta"].astype(bool)).to_numpy())
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+    cont.columns = ["Reaberta", "Total"]
+    return cont
+
+
+# Apenas as reabertas (filtro antes do explode), uma linha por responsável
+PLANO_REABERTAS = (
+    Plano()
+    .filtrar(["Reaberta?"], lambda c: c["Reaberta?"].fillna(False))
+    .explodir("Para", "Responsavel")
+)
+
+
+def reabertas_por_responsavel(df):
+    return PLANO_REABERTAS.executar(df)
+
+
+def reaberturas_por_responsavel(por_pessoa):
+    # Contagens direto do índice (uma entrada por responsável)
+    return (
+        por_pessoa.contagens().rename_axis("Responsavel")
+        .reset_index(name="Total").sort_values("Total")
+    )
+
+
+SQL_POR_RESPONSAVEL = """
+    SELECT r.responsavel AS Responsavel, COUNT(*) AS Total
+    FROM tarefa_responsavel r
+    JOIN tarefas t ON t.arquivo = r.arquivo AND t.linha = r.linha
+    WHERE r.arquivo = ? AND t.reaberta = 1 AND r.responsavel IS NOT NULL
+    GROUP BY r.responsavel
+    ORDER BY r.responsavel
+"""
+
+
+def reaberturas_por_responsavel_sql(chave):
+    return armazem.consultar(SQL_POR_RESPONSAVEL, (chave,)).sort_values("Total")
+
+
+# Uma linha por reaberta e responsável (sem responsável: NULL), como o PLANO_REABERTAS
+SQL_REABERTAS = """
+    SELECT r.linha, r.responsavel AS Responsavel
+    FROM tarefa_responsavel r
+    JOIN tarefas t ON t.arquivo = r.arquivo AND t.linha = r.linha
+    WHERE r.arquivo = ? AND t.reaberta = 1 {filtro}
+"""
+
+COLUNAS_TABELA = ["Tarefa", "Responsavel", "Criada em", "Reaberta?"]
+
+
+def _tabela(df_view):
+    tabela = df_view[COLUNAS_TABELA].sort_values("Criada em", ascending=False)
+    return tabela.assign(**{"Reaberta?": sim_nao(tabela["Reaberta?"])})
+
+
+def tabela_responsavel_sql(df, chave, pessoa):
+    """Tabela de detalhe com as linhas escolhidas no banco."""
+    if pessoa == "(todas)":
+        sql, parametros = SQL_REABERTAS.format(filtro=""), (chave,)
+    else:
+        sql, parametros = SQL_REABERTAS.format(filtro="AND r.responsavel = ?"), (chave, pessoa)
+    return _tabela(armazem.linhas(df, sql, parametros, colunas=COLUNAS_TABELA))
+
+
+def cubo_reabertas(df):
+    """Cubo diário por "Criada em"; a média da medida é a taxa de reabertura."""
+    return Cubo.construir(df["Criada em"], df["Reaberta?"].astype("float64"))
+
+
+SQL_CUBO = f"""
+    SELECT {armazem.dia_sql("criada_em")} AS dia, '' AS dimensao, COUNT(*) AS n,
+           SUM(reaberta) AS soma, SUM(reaberta * reaberta) AS soma_quadrados
+    FROM tarefas
+    WHERE arquivo = ? AND criada_em IS NOT NULL AND reaberta IS NOT NULL
+    GROUP BY dia
+"""
+
+
+def cubo_reabertas_sql(chave):
+    return armazem.cubo(SQL_CUBO, (chave,))
+
+
+def taxa_reabertura(cubo, frequencia):
+    tendencia = cubo.agregar(frequencia).resultado()
+    tendencia["taxa"] = (tendencia["media"] * 100).round(2)
+    tendencia["reabertas"] = tendencia["soma"].astype("int64")
+    return tendencia[["periodo", "n", "reabertas", "taxa"]]
+
+
+def grafico_taxa(tendencia):
+    return px.line(
+        tendencia, x="periodo", y="taxa", markers=True,
+        labels={"periodo": "Período", "taxa": "Reabertas (%)"}, height=400,
+    )
+
+
+def grafico_pizza(cont):
+    return px.pie(cont, names="Reaberta", values="Total", hole=0.4)
+
+
+def grafico_responsaveis(agrup):
+    fig2 = px.bar(
+        agrup, x="Total", y="Responsavel",
+        orientation="h", text="Total", height=500
+    )
+    fig2.update_layout(
+        xaxis=dict(showgrid=True, gridcolor="#cccccc", gridwidth=0.5),
+        yaxis=dict(showgrid=False),   # normalmente não usamos grid no eixo categórico
+    )
+    return fig2
+
+
+# ===================================================================
+# =====================  A N Á L I S E   R E A B E R T A S  ==========
+# ===================================================================
+def exibir(df, chave):
+
+    st.subheader("🔁 Análise de Tarefas Reabertas")
+
+    # Pie-chart Sim X Não
+    no_banco = armazem.contem(chave)
+    cont = memorizar(
+        chave, "reabertas.pizza", (),
+        lambda: contagem_reaberta_sql(chave) if no_banco else contagem_reaberta(df),
+    )
+    exibir_figura(cont, grafico_pizza)
+
+    # Apenas reabertas, uma linha por responsável (montado uma vez por arquivo;
+    # com a planilha no banco, o detalhe sai de lá)
+    if not no_banco:
+        df_r, por_pessoa = tabela_indexada(
+            chave, "reabertas",
+            lambda: reabertas_por_responsavel(df),
+            "Responsavel",
+        )
+
+    # Gráfico por pessoa
+    agrup = memorizar(
+        chave, "reabertas.responsavel", (),
+        lambda: reaberturas_por_responsavel_sql(chave) if no_banco else reaberturas_por_responsavel(por_pessoa),
+    )
+    exibir_figura(agrup, grafico_responsaveis)
+
+    # DataFrame filtrável
+    st.markdown("### 📄 Tarefas por Responsável")
+
+    responsaveis = sorted(agrup["Responsavel"].tolist()) if no_banco else list(por_pessoa.rotulos)
+    pessoa = st.selectbox("Filtrar por responsável:", ["(todas)"] + responsaveis)
+
+    def tabela():
+        if no_banco:
+            return tabela_responsavel_sql(df, chave, pessoa)
+        return _tabela(df_r if pessoa == "(todas)" else df_r.iloc[por_pessoa.posicoes(pessoa)])
+
+    tabela_paginada(
+        memorizar(chave, "reabertas.tabela", (pessoa,), tabela),
+        chave, "reabertas.tabela", (pessoa,)
+    )
+
+    # Tendência: taxa de reabertura por período (do cubo)
+    st.markdown("### 📈 Taxa de reabertura por período")
+
+    granularidade = escolher_granularidade("reabertas.granularidade", padrao="Semana")
+    cubo = memorizar(
+        chave, "reabertas.cubo", (), lambda: cubo_reabertas_sql(chave) if no_banco else cubo_reabertas(df)
+    )
+    tendencia = memorizar(
+        chave, "reabertas.tendencia", (granularidade,),
+        lambda: taxa_reabertura(cubo, GRANULARIDADES[granularidade]),
+    )
+    exibir_figura(tendencia, grafico_taxa)
+    detalhar(tendencia, "reabertas.periodo", ["n", "reabertas", "taxa"])
+
+
+def relatorio(df, frequencia):
+    """Seções do relatório em lote (mesmos agregados do dashboard)."""
+    cont = contagem_reaberta(df)
+    df_r = reabertas_por_responsavel(df)
+    agrup = reaberturas_por_responsavel(IndiceAtribuicao.construir(df_r["Responsavel"]))
+    tendencia = taxa_reabertura(cubo_reabertas(df), frequencia)
+    return [
+        Secao("pizza", "Tarefas reabertas", cont, grafico_pizza(cont)),
+        Secao("responsaveis", "Reaberturas por responsável", agrup, grafico_responsaveis(agrup)),
+        Secao("tendencia", "Taxa de reabertura por período", tendencia, grafico_taxa(tendencia)),
+    ]
@@ -0,0 +1,380 @@
+"""Tempo entre a entrega desejada e o fechamento, por equipe."""
+
+import streamlit as st
+import plotly.express as px
+
+from atlantico import armazem, previa, quantis
+from atlantico.analises import Secao
+from atlantico.cubos import GRANULARIDADES, Cubo, detalhar, escolher_granularidade
+from atlantico.figuras import exibir_figura
+from atlantico.indice import tabela_indexada
+from atlantico.plano import TEMPO_DIAS, Coluna, Plano
+from atlantico.resultados import memorizar
+from atlantico.tabela import tabela_paginada
+
+
+# O tempo e o filtro não dependem da equipe: o plano os aplica antes do
+# explode, sobre menos linhas
+PLANO_TEMPO = (
+    Plano()
+    # 1) CÁLCULO DO TEMPO (horas; NaN quando falta uma das datas)
+    .derivar(TEMPO_DIAS)
+    .filtrar(["tempo_dias"], lambda c: c["tempo_dias"].abs() < 10000)
+    # 2) EXPANDIR EQUIPES
+    .explodir("Equipe", "Equipe")
+    # Tarefas sem equipe continuam agrupadas como "nan"
+    .derivar(Coluna("Equipe", ("Equipe",), lambda c: c["Equipe"].astype(str)))
+)
+
+
+def preparar_tempo(df, chave=None):
+    if "Equipe" not in df.columns:
+        df = df.assign(Equipe="")
+    return PLANO_TEMPO.executar(df, chave).reset_index(drop=True)
+
+
+def _ordenar_media(agrupado):
+    agrupado = agrupado.sort_values("tempo_dias", ascending=False)
+    agrupado["tempo_dias"] = agrupado["tempo_dias"].round(2)
+    return agrupado
+
+
+def media_por_equipe(df_valid):
+    return _ordenar_media(df_valid.groupby("Equipe")["tempo_dias"].mean().reset_index())
+
+
+def atraso_por_equipe(df_valid):
+    """Média dos atrasos (em horas, positivos) por equipe; None se não há atrasos."""
+    df_atrasos = df_valid[df_valid["tempo_dias"] < 0]
+
+    if df_atrasos.empty:
+        return None
+    atrasos = df_atrasos["tempo_dias"] * -1
+    return _ordenar_media(atrasos.groupby(df_atrasos["Equipe"]).mean().reset_index())
+
+
+# Mesmo cálculo do preparar_tempo (datas em ns no banco), uma linha por
+# tarefa e equipe; tarefas sem equipe continuam agrupadas como "nan"
+_SQL_TEMPOS_POR_LINHA = f"""
+    WITH tempos AS (
+        SELECT e.linha, COALESCE(e.equipe, 'nan') AS Equipe, t.fechada_em,
+               (t.fechada_em - t.entrega_desejada) / {armazem.DIA_NS}.0 * 24 * -1 AS tempo_dias
+        FROM tarefa_equipe e
+        JOIN tarefas t ON t.arquivo = e.arquivo AND t.linha = e.linha
+        WHERE e.arquivo = ? AND t.fechada_em IS NOT NULL AND t.entrega_desejada IS NOT NULL
+    )
+"""
+
+SQL_TEMPOS = _SQL_TEMPOS_POR_LINHA + """
+    SELECT Equipe, AVG({valor}) AS tempo_dias
+    FROM tempos
+    WHERE ABS(tempo_dias) < 10000 {filtro}
+    GROUP BY Equipe
+    ORDER BY Equipe
+"""
+
+SQL_EQUIPES = _SQL_TEMPOS_POR_LINHA + """
+    SELECT DISTINCT Equipe FROM tempos WHERE ABS(tempo_dias) < 10000 ORDER BY Equipe
+"""
+
+SQL_DETALHE = _SQL_TEMPOS_POR_LINHA + """
+    SELECT linha, Equipe, tempo_dias FROM tempos WHERE ABS(tempo_dias) < 10000 {filtro}
+"""
+
+SQL_ATRASOS = _SQL_TEMPOS_POR_LINHA + """
+    SELECT Equipe, -tempo_dias AS atraso FROM tempos WHERE tempo_dias < 0 AND tempo_dias > -10000
+"""
+
+SQL_CUBO = _SQL_TEMPOS_POR_LINHA + f"""
+    SELECT {armazem.dia_sql("fechada_em")} AS dia, Equipe AS dimensao, COUNT(*) AS n,
+           SUM(-tempo_dias) AS soma, SUM(tempo_dias * tempo_dias) AS soma_quadrados
+    FROM tempos
+    WHERE tempo_dias < 0 AND tempo_dias > -10000
+    GROUP BY dia, Equipe
+"""
+
+
+def media_por_equipe_sql(chave):
+    return _ordenar_media(armazem.consultar(SQL_TEMPOS.format(valor="tempo_dias", filtro=""), (chave,)))
+
+
+def atraso_por_equipe_sql(chave):
+    agrupado = armazem.consultar(
+        SQL_TEMPOS.format(valor="-tempo_dias", filtro="AND tempo_dias < 0"), (chave,)
+    )
+    return None if agrupado.empty else _ordenar_media(agrupado)
+
+
+def _ordenar_distribuicao(distribuicao):
+    distribuicao = distribuicao.sort_values("p90", ascending=False)
+    colunas = ["p50", "p90", "p99", "media_aparada"]
+    distribuicao[colunas] = distribuicao[colunas].astype("float64").round(2)
+    return distribuicao.reset_index(drop=True)
+
+
+def distribuicao_atrasos(df_valid):
+    """n, p50/p90/p99 e média aparada (10%) das horas de atraso por equipe (exatos)."""
+    atrasos = df_valid[df_valid["tempo_dias"] < 0]
+    return _ordenar_distribuicao(quantis.resumo_exato(-atrasos["tempo_dias"], atrasos["Equipe"], "Equipe"))
+
+
+def distribuicao_atrasos_sql(chave):
+    # Quantis exatos: só os atrasos (equipe, horas) saem do banco
+    atrasos = armazem.consultar(SQL_ATRASOS, (chave,))
+    return _ordenar_distribuicao(quantis.resumo_exato(atrasos["atraso"], atrasos["Equipe"], "Equipe"))
+
+
+class DistribuicaoEmBlocos:
+    """Mesma distribuição, estimada por esboços mesclados bloco a bloco.
+
+    Segue a interface dos agregadores de atlantico.agregacao (ver
+    `agregar_planilha`), para o relatório com memória limitada.
+    """
+
+    colunas = ["Equipe", "Entrega desejada", "Fechada em"]
+
+    def __init__(self):
+        self.esbocos = {}
+
+    def atualizar(self, bloco):
+        if not {"Entrega desejada", "Fechada em"} <= set(bloco.columns) or bloco.empty:
+            return
+        df_valid = preparar_tempo(bloco)
+        atrasos = df_valid[df_valid["tempo_dias"] < 0]
+        self.esbocos = quantis.mesclar_grupos(
+            self.esbocos, quantis.por_grupo(-atrasos["tempo_dias"], atrasos["Equipe"])
+        )
+
+    def resultado(self):
+        return _ordenar_distribuicao(quantis.resumo(self.esbocos, "Equipe"))
+
+
+def cubo_atrasos(df_valid):
+    """Cubo diário (por "Fechada em") das horas de atraso, por equipe."""
+    atrasos = df_valid[df_valid["tempo_dias"] < 0]
+    return Cubo.construir(atrasos["Fechada em"], -atrasos["tempo_dias"], atrasos["Equipe"])
+
+
+def cubo_atrasos_sql(chave):
+    return armazem.cubo(SQL_CUBO, (chave,), "Equipe")
+
+
+COLUNAS_TABELA = ["ID da Tarefa", "Tarefa", "Equipe", "Entrega desejada", "Fechada em", "tempo_dias"]
+
+
+def _ordenar_tabela(amostra):
+    cols = [c for c in COLUNAS_TABELA if c in amostra.columns]
+    return amostra[cols].sort_values("tempo_dias", ascending=False).reset_index(drop=True)
+
+
+def tabela_equipe_sql(df, chave, equipe):
+    """Tabela de detalhe com as linhas (e o tempo) escolhidas no banco."""
+    if equipe == "(todas)":
+        sql, parametros = SQL_DETALHE.format(filtro=""), (chave,)
+    else:
+        sql, parametros = SQL_DETALHE.format(filtro="AND Equipe = ?"), (chave, equipe)
+    return _ordenar_tabela(armazem.linhas(df, sql, parametros, colunas=COLUNAS_TABELA))
+
+
+def atraso_por_periodo(cubo, frequencia):
+    tendencia = cubo.agregar(frequencia).resultado()
+    tendencia[["media", "desvio"]] = tendencia[["media", "desvio"]].round(2)
+    return tendencia[["periodo", "Equipe", "n", "media", "desvio"]]
+
+
+def grafico_atraso_periodo(tendencia):
+    return px.line(
+        tendencia, x="periodo", y="media", color="Equipe", markers=True,
+        labels={"periodo": "Período", "media": "Média de atraso (HORAS)"}, height=450,
+    )
+
+
+def grafico_distribuicao(distribuicao):
+    return px.bar(
+        distribuicao.melt(id_vars="Equipe", value_vars=["p50", "p90", "p99"], var_name="Quantil", value_name="horas"),
+        x="Equipe", y="horas", color="Quantil", barmode="group",
+        labels={"horas": "Atraso (HORAS)"}, height=450,
+    )
+
+
+def grafico_media(agrupado):
+    fig_tempo = px.bar(
+        agrupado,
+        x="Equipe",
+        y="tempo_dias",
+        text="tempo_dias",
+        labels={"tempo_dias": "Horas (média)", "Equipe": "Equipe"},
+        height=500
+    )
+    fig_tempo.update_traces(textposition="outside")
+    fig_tempo.update_layout(margin=dict(l=150, r=40, t=50, b=50))
+    return fig_tempo
+
+
+def grafico_atraso(agrupado_atraso):
+    # --- Gráfico de barras vertical (como solicitado)
+    fig_atraso = px.bar(
+        agrupado_atraso,
+        x="Equipe",
+        y="tempo_dias",
+        text="tempo_dias",
+        labels={"tempo_dias": "Média de atraso (HORAS)", "Equipe": "Equipe"},
+        height=450
+    )
+    fig_atraso.update_traces(textposition="outside")
+    return fig_atraso
+
+
+def estimativas(df_amostra):
+    """Média e média dos atrasos por equipe na amostra, com IC 95% (prévia)."""
+    atrasos = df_amostra[df_amostra["tempo_dias"] < 0]
+    return (
+        previa.media_com_intervalo(df_amostra["tempo_dias"], df_amostra["Equipe"]),
+        previa.media_com_intervalo(-atrasos["tempo_dias"], atrasos["Equipe"]),
+    )
+
+
+def dados(df, chave):
+    """(df_valid, índice por equipe, média, atrasos por equipe), uma vez por arquivo.
+
+    Com a planilha no banco, df_valid e o índice não são montados (None):
+    o detalhe também sai do banco.
+    """
+    no_banco = armazem.contem(chave)
+    if no_banco:
+        df_valid = por_equipe = None
+    else:
+        # Montado uma vez por arquivo, junto com o índice equipe -> linhas
+        df_valid, por_equipe = tabela_indexada(chave, "tempo", lambda: preparar_tempo(df, chave), "Equipe")
+
+    agrupado = memorizar(
+        chave, "tempo.media", (),
+        lambda: media_por_equipe_sql(chave) if no_banco else media_por_equipe(df_valid),
+    )
+    agrupado_atraso = memorizar(
+        chave, "tempo.atraso", (),
+        lambda: atraso_por_equipe_sql(chave) if no_banco else atraso_por_equipe(df_valid),
+    )
+    return df_valid, por_equipe, agrupado, agrupado_atraso
+
+
+def exibir_previa(df, chave):
+    previa.aviso(df)
+    # Amostra preparada sem a chave: as colunas derivadas não vão para o cache do arquivo
+    media, atraso = memorizar(
+        chave, "tempo.previa", (), lambda: estimativas(preparar_tempo(previa.amostra(df, chave)))
+    )
+    exibir_figura(media, previa.grafico_intervalo, x="Equipe", y="media", rotulo="Horas (média)")
+    st.markdown("### ⚠ Tempo de Atraso (somente valores positivos)")
+    if atraso.empty:
+        st.info("Nenhum atraso na amostra.")
+    else:
+        exibir_figura(atraso, previa.grafico_intervalo, x="Equipe", y="media", rotulo="Média de atraso (HORAS)")
+
+
+# ======================================================
+# ANÁLISE 2 — TEMPO ENTRE ENTREGA DESEJADA E FECHADA
+# ======================================================
+def exibir(df, chave):
+
+    st.markdown("### ⏱ Análise de Tempo entre Entrega Desejada e Fechada (por Equipe)")
+
+    # Exportação enorme com a prévia ligada: amostra agora, exato em segundo plano
+    if previa.ativa(df) and not previa.exato(chave, "tempo", lambda: dados(df, chave)):
+        exibir_previa(df, chave)
+        return
+
+    df_valid, por_equipe, agrupado, agrupado_atraso = dados(df, chave)
+    no_banco = df_valid is None
+
+    # ---------------------------
+    # 3) MÉDIA GERAL POR EQUIPE
+    # ---------------------------
+    exibir_figura(agrupado, grafico_media)
+
+
+    # ======================================================
+    # 4) NOVA ANÁLISE — MÉDIA SOMENTE DOS ATRASOS
+    # ======================================================
+    st.markdown("### ⚠ Tempo de Atraso (somente valores positivos)")
+
+    if agrupado_atraso is None:
+        st.info("Nenhum atraso encontrado.")
+    else:
+        exibir_figura(agrupado_atraso, grafico_atraso)
+
+        # Cauda dos atrasos: quantis e média aparada por equipe
+        st.markdown("#### 📊 Distribuição do atraso por equipe")
+        distribuicao = memorizar(
+            chave, "tempo.distribuicao", (),
+            lambda: distribuicao_atrasos_sql(chave) if no_banco else distribuicao_atrasos(df_valid),
+        )
+        exibir_figura(distribuicao, grafico_distribuicao)
+        st.dataframe(distribuicao, use_container_width=True)
+
+
+    # ---------------------------
+    # 5) DIAGNÓSTICO POR EQUIPE (mantido)
+    # ---------------------------
+    st.markdown("#### 🔎 Inspecionar valores individuais por equipe")
+
+    if no_banco:
+        equipes = memorizar(
+            chave, "tempo.equipes", (), lambda: armazem.consultar(SQL_EQUIPES, (chave,))["Equipe"].tolist()
+        )
+    else:
+        equipes = list(por_equipe.rotulos)
+    equipe_sel = st.selectbox("Selecione uma equipe", ["(todas)"] + equipes)
+
+    def tabela():
+        if no_banco:
+            return tabela_equipe_sql(df, chave, equipe_sel)
+        amostra = df_valid if equipe_sel == "(todas)" else df_valid.iloc[por_equipe.posicoes(equipe_sel)]
+        return _ordenar_tabela(amostra)
+
+    tabela_paginada(
+        memorizar(chave, "tempo.tabela", (equipe_sel,), tabela),
+        chave, "tempo.tabela", (equipe_sel,)
+    )
+
+    # ---------------------------
+    # 6) TENDÊNCIA DO ATRASO POR EQUIPE (do cubo)
+    # ---------------------------
+    st.markdown("### 📈 Média de atraso por equipe e período")
+
+    granularidade = escolher_granularidade("tempo.granularidade")
+    cubo = memorizar(
+        chave, "tempo.cubo", (), lambda: cubo_atrasos_sql(chave) if no_banco else cubo_atrasos(df_valid)
+    )
+    tendencia = memorizar(
+        chave, "tempo.tendencia", (granularidade,),
+        lambda: atraso_por_periodo(cubo, GRANULARIDADES[granularidade]),
+    )
+    if tendencia.empty:
+        st.info("Nenhum atraso encontrado.")
+    else:
+        exibir_figura(tendencia, grafico_atraso_periodo)
+        detalhar(tendencia, "tempo.periodo", ["Equipe", "n", "media", "desvio"])
+
+
+def relatorio(df, frequencia):
+    """Seções do relatório em lote (mesmos agregados do dashboard)."""
+    df_valid = preparar_tempo(df)
+    agrupado = media_por_equipe(df_valid)
+    agrupado_atraso = atraso_por_equipe(df_valid)
+    tendencia = atraso_por_periodo(cubo_atrasos(df_valid), frequencia)
+    secoes = [Secao("media", "Tempo médio por equipe (horas)", agrupado, grafico_media(agrupado))]
+    if agrupado_atraso is not None:
+        distribuicao = distribuicao_atrasos(df_valid)
+        secoes += [
+            Secao("atraso", "Média de atraso por equipe", agrupado_atraso, grafico_atraso(agrupado_atraso)),
+            Secao(
+                "distribuicao", "Distribuição do atraso por equipe (p50/p90/p99, média aparada 10%)",
+                distribuicao, grafico_distribuicao(distribuicao),
+            ),
+        ]
+    if not tendencia.empty:
+        secoes.append(
+            Secao("tendencia", "Média de atraso por equipe e período", tendencia, grafico_atraso_periodo(tendencia))
+        )
+    return secoes
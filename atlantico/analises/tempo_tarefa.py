@@ -0,0 +1,303 @@
+"""Tempo total e médio registrado por tipo de tarefa."""
+
+import streamlit as st
+import plotly.express as px
+
+from atlantico import armazem, incremental, previa
+from atlantico.analises import Secao
+from atlantico.cubos import GRANULARIDADES, Cubo, detalhar, escolher_granularidade
+from atlantico.figuras import exibir_figura
+from atlantico.plano import HORAS, Plano
+from atlantico.resultados import memorizar
+from atlantico.tabela import tabela_paginada
+
+
+# Horas convertidas para número, sem linhas sem valor
+PLANO_REGISTROS = (
+    Plano()
+    .derivar(HORAS)
+    .filtrar(
+        ["Já registradas h", "Tipo de tarefa"],
+        lambda c: c["Já registradas h"].notna() & c["Tipo de tarefa"].notna(),
+    )
+)
+
+
+def registros_com_tempo(df, chave=None):
+    return PLANO_REGISTROS.executar(df, chave)
+
+
+def _ordenar_por_tipo(agrupado):
+    agrupado = agrupado.sort_values("Já registradas h", ascending=False)
+    agrupado["Já registradas h"] = agrupado["Já registradas h"].round(2)
+    return agrupado
+
+
+def tempo_por_tipo(df_temp, agregacao):
+    """Soma ("sum") ou média ("mean") das horas por tipo de tarefa."""
+    return _ordenar_por_tipo(
+        # Horas guardadas em float32; soma/média em float64
+        df_temp["Já registradas h"].astype("float64")
+        .groupby(df_temp["Tipo de tarefa"], observed=True)
+        .agg(agregacao)
+        .reset_index()
+    )
+
+
+SQL_POR_TIPO = """
+    SELECT tipo AS "Tipo de tarefa", {funcao}(registradas_h) AS "Já registradas h"
+    FROM tarefas
+    WHERE arquivo = ? AND tipo IS NOT NULL AND registradas_h IS NOT NULL
+    GROUP BY tipo
+    ORDER BY tipo
+"""
+
+
+def tempo_por_tipo_sql(chave, agregacao):
+    funcao = {"sum": "SUM", "mean": "AVG"}[agregacao]
+    return _ordenar_por_tipo(armazem.consultar(SQL_POR_TIPO.format(funcao=funcao), (chave,)))
+
+
+def tempo_por_tipo_incremental(agregado, agregacao):
+    """Soma ou média por tipo a partir do agregado mantido pelo modo incremental."""
+    coluna = {"sum": "soma", "mean": "media"}[agregacao]
+    com_horas = agregado[agregado["n"] > 0]
+    return _ordenar_por_tipo(
+        com_horas[coluna].rename("Já registradas h").rename_axis("Tipo de tarefa").reset_index()
+    )
+
+
+def cubo_horas(df_temp):
+    """Cubo diário (por "Criada em") das horas registradas, por tipo de tarefa."""
+    return Cubo.construir(df_temp["Criada em"], df_temp["Já registradas h"], df_temp["Tipo de tarefa"])
+
+
+SQL_CUBO = f"""
+    SELECT {armazem.dia_sql("criada_em")} AS dia, tipo AS dimensao, COUNT(*) AS n,
+           SUM(registradas_h) AS soma, SUM(registradas_h * registradas_h) AS soma_quadrados
+    FROM tarefas
+    WHERE arquivo = ? AND criada_em IS NOT NULL AND tipo IS NOT NULL AND registradas_h IS NOT NULL
+    GROUP BY dia, tipo
+"""
+
+
+def cubo_horas_sql(chave):
+    return armazem.cubo(SQL_CUBO, (chave,), "Tipo de tarefa")
+
+
+def horas_por_periodo(cubo, frequencia):
+    tendencia = cubo.agregar(frequencia).resultado()
+    tendencia[["soma", "media"]] = tendencia[["soma", "media"]].round(2)
+    return tendencia[["periodo", "Tipo de tarefa", "n", "soma", "media"]]
+
+
+def grafico_horas_periodo(tendencia):
+    return px.bar(
+        tendencia, x="periodo", y="soma", color="Tipo de tarefa",
+        labels={"periodo": "Período", "soma": "Horas registradas"}, height=450,
+    )
+
+
+def grafico_por_tipo(agrupado, rotulo):
+    fig = px.bar(
+        agrupado,
+        x="Tipo de tarefa",
+        y="Já registradas h",
+        text="Já registradas h",
+        labels={"Já registradas h": rotulo, "Tipo de tarefa": "Tarefa"},
+        height=500
+    )
+
+    fig.update_traces(textposition="outside")
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+# Mesmas linhas do PLANO_REGISTROS
+SQL_REGISTROS = """
+    SELECT linha FROM tarefas
+    WHERE arquivo = ? AND tipo IS NOT NULL AND registradas_h IS NOT NULL {filtro}
+"""
+
+SQL_TIPOS = """
+    SELECT DISTINCT tipo FROM tarefas
+    WHERE arquivo = ? AND tipo IS NOT NULL AND registradas_h IS NOT NULL
+    ORDER BY tipo
+"""
+
+COLUNAS_TABELA = ["ID da Tarefa", "Tarefa", "Tipo de tarefa", "Já registradas h"]
+
+
+def tabela_por_tipo_sql(df, chave, tipo):
+    """Tabela de detalhe com as linhas escolhidas no banco (horas convertidas só nelas)."""
+    if tipo == "(Todas)":
+        sql, parametros = SQL_REGISTROS.format(filtro=""), (chave,)
+    else:
+        sql, parametros = SQL_REGISTROS.format(filtro="AND tipo = ?"), (chave, tipo)
+    registros = armazem.linhas(df, sql, parametros, colunas=COLUNAS_TABELA)
+    return tabela_por_tipo(registros.assign(**{"Já registradas h": HORAS.calcular(registros)}), tipo)
+
+
+def tabela_por_tipo(df_temp, tipo):
+    # Aplicar filtro APENAS no dataframe
+    df_show = df_temp if tipo == "(Todas)" else df_temp[df_temp["Tipo de tarefa"] == tipo]
+
+    # Colunas para exibir
+    colunas_exibir = [c for c in COLUNAS_TABELA if c in df_show.columns]
+
+    return df_show[colunas_exibir].sort_values(
+        "Já registradas h", ascending=False
+    ).reset_index(drop=True)
+
+
+def estimativas(df_amostra, total_linhas):
+    """Total e média das horas por tipo estimados na amostra, com IC 95% (prévia)."""
+    horas, tipos = df_amostra["Já registradas h"], df_amostra["Tipo de tarefa"]
+    return (
+        # Total: horas 0 nas linhas sem registro, que também fazem parte da amostra
+        previa.total_com_intervalo(horas.fillna(0), tipos, total_linhas),
+        previa.media_com_intervalo(horas.dropna(), tipos[horas.notna()]),
+    )
+
+
+def dados(df, chave, agregado=None):
+    """(df_temp, total por tipo, média por tipo), uma vez por arquivo.
+
+    `agregado` é o agregado por tipo do modo incremental (lido na thread
+    do script, ver `incremental.agregado`), usado no lugar do groupby.
+    Com a planilha no banco, df_temp não é montado (None): o detalhe
+    também sai do banco.
+    """
+    no_banco = armazem.contem(chave)
+    df_temp = None if no_banco else memorizar(
+        chave, "tempo_tarefa.registros", (), lambda: registros_com_tempo(df, chave)
+    )
+
+    if agregado is not None:
+        fonte = "incremental"
+    elif no_banco:
+        fonte = "banco"
+    else:
+        fonte = "pandas"
+
+    def por_tipo(agregacao):
+        if fonte == "incremental":
+            return tempo_por_tipo_incremental(agregado, agregacao)
+        if fonte == "banco":
+            return tempo_por_tipo_sql(chave, agregacao)
+        return tempo_por_tipo(df_temp, agregacao)
+
+    # A fonte entra na chave: o resultado de uma sessão não vale para as outras
+    total_por_tarefa = memorizar(chave, "tempo_tarefa.total", (fonte,), lambda: por_tipo("sum"))
+    media_por_tarefa = memorizar(chave, "tempo_tarefa.media", (fonte,), lambda: por_tipo("mean"))
+    return df_temp, total_por_tarefa, media_por_tarefa
+
+
+def exibir_previa(df, chave):
+    previa.aviso(df)
+    amostra = previa.amostra(df, chave)
+    total, media = memorizar(
+        chave, "tempo_tarefa.previa", (),
+        lambda: estimativas(amostra.assign(**{"Já registradas h": HORAS.calcular(amostra)}), len(df)),
+    )
+    st.markdown("### 📊 Tempo Total Registrado por Tarefa")
+    exibir_figura(total, previa.grafico_intervalo, x="Tipo de tarefa", y="total", rotulo="Tempo Total (h)")
+    st.markdown("### 📊 Tempo Médio Registrado por Tarefa")
+    exibir_figura(media, previa.grafico_intervalo, x="Tipo de tarefa", y="media", rotulo="Tempo Médio (h)")
+
+
+# ======================================================
+# ANÁLISE 3  — TEMPO TOTAL E MÉDIO POR Tipo de Tarefa
+# ======================================================
+def exibir(df, chave):
+
+    st.markdown("## 🧮 Análise de Tempo Total e Médio por Tipo de Tarefa")
+
+    # Verificar se a coluna existe
+    if "Já registradas h" not in df.columns:
+        st.error("A coluna 'Já registradas h' não existe no arquivo enviado.")
+        st.stop()
+
+    # Base incremental sincronizada com este arquivo: agregados já mantidos.
+    # Lida aqui, na thread do script (o cálculo da prévia roda em outra)
+    agregado = incremental.agregado(chave, "tipo")
+
+    # Exportação enorme com a prévia ligada: amostra agora, exato em segundo plano
+    if previa.ativa(df) and not previa.exato(chave, "tempo_tarefa", lambda: dados(df, chave, agregado)):
+        exibir_previa(df, chave)
+        return
+
+    df_temp, total_por_tarefa, media_por_tarefa = dados(df, chave, agregado)
+    no_banco = df_temp is None
+
+    # ===============================
+    # 1) AGRUPAMENTO — TEMPO TOTAL
+    # ===============================
+    st.markdown("### 📊 Tempo Total Registrado por Tarefa")
+    exibir_figura(total_por_tarefa, grafico_por_tipo, rotulo="Tempo Total (h)")
+
+    # ===============================
+    # 2) AGRUPAMENTO — TEMPO MÉDIO
+    # ===============================
+    st.markdown("### 📊 Tempo Médio Registrado por Tarefa")
+    exibir_figura(media_por_tarefa, grafico_por_tipo, rotulo="Tempo Médio (h)")
+
+
+    # ===============================
+    # 3) DATAFRAME FINAL (com filtro selecionado pelo usuário)
+    # ===============================
+    st.markdown("### 📄 Dados utilizados nos cálculos")
+
+    # Lista de tipos disponíveis no dataframe filtrado
+    tipos_df = memorizar(
+        chave, "tempo_tarefa.tipos", (),
+        lambda: armazem.consultar(SQL_TIPOS, (chave,))["tipo"].tolist() if no_banco
+        else sorted(df_temp["Tipo de tarefa"].dropna().unique().tolist()),
+    )
+
+    tipo_df_sel = st.selectbox(
+        "Selecione o tipo de tarefa para exibição no dataframe:",
+        options=["(Todas)"] + tipos_df
+    )
+
+    df_show = memorizar(
+        chave, "tempo_tarefa.tabela", (tipo_df_sel,),
+        lambda: tabela_por_tipo_sql(df, chave, tipo_df_sel) if no_banco else tabela_por_tipo(df_temp, tipo_df_sel),
+    )
+
+    tabela_paginada(df_show, chave, "tempo_tarefa.tabela", (tipo_df_sel,))
+
+    # ===============================
+    # 4) TENDÊNCIA — HORAS POR TIPO E PERÍODO (do cubo)
+    # ===============================
+    st.markdown("### 📈 Horas registradas por tipo e período")
+
+    if "Criada em" not in df.columns:
+        return
+    granularidade = escolher_granularidade("tempo_tarefa.granularidade")
+    cubo = memorizar(
+        chave, "tempo_tarefa.cubo", (), lambda: cubo_horas_sql(chave) if no_banco else cubo_horas(df_temp)
+    )
+    tendencia = memorizar(
+        chave, "tempo_tarefa.tendencia", (granularidade,),
+        lambda: horas_por_periodo(cubo, GRANULARIDADES[granularidade]),
+    )
+    exibir_figura(tendencia, grafico_horas_periodo)
+    detalhar(tendencia, "tempo_tarefa.periodo", ["Tipo de tarefa", "n", "soma", "media"])
+
+
+def relatorio(df, frequencia):
+    """Seções do relatório em lote (mesmos agregados do dashboard)."""
+    df_temp = registros_com_tempo(df)
+    total = tempo_por_tipo(df_temp, "sum")
+    media = tempo_por_tipo(df_temp, "mean")
+    secoes = [
+        Secao("total", "Tempo total registrado por tipo", total, grafico_por_tipo(total, rotulo="Tempo Total (h)")),
+        Secao("media", "Tempo médio registrado por tipo", media, grafico_por_tipo(media, rotulo="Tempo Médio (h)")),
+    ]
+    if "Criada em" in df_temp.columns:
+        tendencia = horas_por_periodo(cubo_horas(df_temp), frequencia)
+        secoes.append(
+            Secao("tendencia", "Horas registradas por tipo e período", tendencia, grafico_horas_periodo(tendencia))
+        )
+    return secoes
@@ -0,0 +1,177 @@
+"""Dashboard de tarefas: upload, cards resumo e as análises registradas."""
+
+import streamlit as st
+
+from atlantico import analises, armazem, figuras, incremental, perfil, previa, registro, resultados, segundo_plano
+from atlantico.ingestao import (
+    carregar_planilha,
+    chave_arquivo,
+    datas_invalidas_planilha,
+    memoria_planilha,
+    planilha_em_memoria,
+)
+from atlantico.periodo import filtrar_periodo
+from atlantico.ui import cards_andamento, cards_resumo
+
+# Colunas usadas fora das análises (cards resumo e filtro de período)
+COLUNAS_BASE = ["Criada em", "Fechada em"]
+
+
+def executar(nomes=None):
+    """Monta a página com as análises `nomes` (todas, se None)."""
+    nomes = list(analises.ANALISES) if nomes is None else list(nomes)
+
+    # ----------------------------------------------
+    # CONFIGURAÇÃO DA PÁGINA
+    # ----------------------------------------------
+    st.set_page_config(page_title="Dashboard de Tarefas", layout="wide")
+    st.title("📊 Dashboard de Tarefas")
+
+    figuras.reiniciar_medicao()
+    perfil.iniciar_rerun()
+    try:
+        _pagina(nomes)
+    finally:
+        perfil.exibir_painel(perfil.finalizar_rerun())
+
+
+def _armazenar(uploaded_files, chave):
+    """Grava a planilha no banco local em segundo plano.
+
+    Até a gravação terminar as análises seguem no pandas; depois passam a
+    agregar com SQL no banco.
+    """
+    if armazem.contem(chave):
+        st.sidebar.caption("🗄️ Agregados calculados no banco local")
+        return
+    trabalho = segundo_plano.iniciar(
+        ("armazem", chave),
+        lambda andamento: armazem.ingerir(
+            chave, lambda: carregar_planilha(uploaded_files, colunas=armazem.COLUNAS), andamento
+        ),
+    )
+    if trabalho.futuro.done():
+        trabalho.futuro.result()  # relança erros da gravação
+        return
+
+    @st.fragment(run_every=previa.INTERVALO)
+    def acompanhar():
+        if trabalho.futuro.done():
+            st.rerun()
+        st.caption(f"🗄️ {trabalho.andamento.texto}")
+
+    with st.sidebar:
+        acompanhar()
+
+
+def _pagina(nomes):
+    # Controle da análise ativa
+    if "active_analysis" not in st.session_state:
+        st.session_state.active_analysis = None
+
+    # ----------------------------------------------
+    # SIDEBAR – UPLOAD E BOTÕES
+    # ----------------------------------------------
+    st.sidebar.header("📁 Carregar Arquivo")
+    # Vários arquivos (ex.: exportações mensais) viram um único conjunto
+    uploaded_files = st.sidebar.file_uploader(
+        "Envie um ou mais arquivos Excel", type=["xlsx", "xls"], accept_multiple_files=True
+    )
+
+    for nome in nomes:
+        if st.sidebar.button(analises.ANALISES[nome].rotulo):
+            st.session_state.active_analysis = nome
+
+    # ----------------------------------------------
+    # SE NÃO HÁ ARQUIVO, ENCERRA
+    # ----------------------------------------------
+    if not uploaded_files:
+        st.info("⬅️ Envie um arquivo Excel para começar")
+        st.stop()
+
+    # ----------------------------------------------
+    # LEITURA DO ARQUIVO (uma vez para todas as análises)
+    # ----------------------------------------------
+    with perfil.etapa("leitura"):
+        colunas = COLUNAS_BASE + analises.colunas(nomes)
+        chave = chave_arquivo(uploaded_files)
+        # A sessão passa a referenciar o conjunto (um por conteúdo no processo)
+        registro.vincular(st.session_state, chave)
+        if not planilha_em_memoria(uploaded_files, colunas):
+            # Lida em segundo plano; reexecuções (cliques) acompanham o mesmo trabalho
+            trabalho = segundo_plano.iniciar(
+                (chave, tuple(sorted(colunas))),
+                lambda andamento: carregar_planilha(uploaded_files, colunas, andamento),
+            )
+            segundo_plano.aguardar(trabalho, cards_andamento)
+        df = carregar_planilha(uploaded_files, colunas=colunas)
+
+    if armazem.ativo():
+        with perfil.etapa("armazem"):
+            _armazenar(uploaded_files, chave)
+
+    invalidas = {c: n for c, n in (datas_invalidas_planilha(uploaded_files) or {}).items() if n}
+    if invalidas:
+        st.sidebar.warning(
+            "⚠️ Datas não reconhecidas (ficaram vazias): "
+            + ", ".join(f"{coluna}: {n}" for coluna, n in invalidas.items())
+        )
+
+    compartilhado = registro.estatisticas()
+    st.sidebar.caption(
+        f"👥 {compartilhado['sessoes'].get(chave, 0)} sessão(ões) com este arquivo; "
+        f"{compartilhado['conjuntos']} conjunto(s) em memória "
+        f"({compartilhado['bytes'] / 2**20:.1f} MB)"
+    )
+
+    # Daqui em diante df/chave são os da janela escolhida
+    df, chave = filtrar_periodo(df, chave)
+
+    with perfil.etapa("cards"):
+        cards_resumo(df)
+
+    uso = memoria_planilha(uploaded_files)
+    if uso:
+        antes, depois = uso
+        st.sidebar.caption(
+            f"💾 Memória: {antes / 2**20:.1f} MB → {depois / 2**20:.1f} MB após a tipagem"
+        )
+
+    if st.sidebar.checkbox(
+        "🔄 Modo incremental",
+        help="Compara cada nova exportação com a anterior pelo ID da Tarefa "
+             "e atualiza só as tarefas inseridas, alteradas ou removidas.",
+    ):
+        with perfil.etapa("incremental"):
+            incremental.exibir(uploaded_files)
+
+    st.sidebar.checkbox(
+        "⚡ Prévia por amostra",
+        key="previa",
+        help=f"Com mais de {previa.LIMITE_LINHAS:,} tarefas, os gráficos de barras aparecem "
+             "primeiro estimados numa amostra (com intervalo de confiança) e são trocados "
+             "pelo resultado exato assim que ele fica pronto.".replace(",", "."),
+    )
+
+    ativa = st.session_state.active_analysis
+    if ativa in nomes:
+        with perfil.etapa(f"analise.{ativa}"):
+            analises.carregar(ativa).exibir(df, chave)
+
+    medicao = figuras.medicao()
+    if medicao["construidas"] or medicao["reaproveitadas"]:
+        st.sidebar.caption(
+            f"📈 Gráficos: {medicao['construidas']} construídos "
+            f"({medicao['construcao_s'] * 1000:.0f} ms), "
+            f"{medicao['reaproveitadas']} do cache; "
+            f"envio {medicao['exibicao_s'] * 1000:.0f} ms"
+        )
+
+    # Caches do processo (compartilhados por todas as sessões)
+    calculados, graficos = resultados.estatisticas(), figuras.estatisticas()
+    st.sidebar.caption(
+        f"🧠 Cache: {calculados['entradas']} resultado(s) "
+        f"({calculados['bytes'] / 2**20:.1f} MB; {calculados['acertos']} acertos, "
+        f"{calculados['falhas']} falhas) e {graficos['entradas']} gráfico(s) "
+        f"({graficos['bytes'] / 2**20:.1f} MB)"
+    )
@@ -0,0 +1,265 @@
+"""Banco SQLite local com as planilhas já ingeridas (opcional).
+
+Ligado pela variável ATLANTICO_BANCO (caminho do arquivo .db). Cada
+planilha entra uma única vez, identificada pelo hash do conteúdo, nas
+tabelas `tarefas`, `tarefa_responsavel` e `tarefa_equipe`; depois disso
+as análises calculam os agregados com SQL no próprio banco (e escolhem
+ali as linhas das tabelas de detalhe, sem preparar o DataFrame inteiro),
+e todas as sessões e dashboards do servidor consultam a mesma cópia.
+Tudo local, sem rede. Só as MAX_ARQUIVOS planilhas ingeridas mais
+recentemente ficam no banco; as mais antigas são apagadas a cada nova
+ingestão.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import pandas as pd
+
+from atlantico.cubos import Cubo
+from atlantico.transformacoes import explodir_multivalorado
+
+# String vazia (padrão) desliga o banco
+CAMINHO = os.environ.get("ATLANTICO_BANCO", "")
+MAX_ARQUIVOS = 20
+
+# Um dia em nanossegundos (as datas ficam no banco em ns desde 1970)
+DIA_NS = 86_400_000_000_000
+
+# Colunas da planilha levadas para o banco
+COLUNAS = [
+    "ID da Tarefa", "Tipo de tarefa", "Reaberta?", "Criada em", "Entrega desejada",
+    "Fechada em", "Já registradas h", "%", "Para", "Equipe",
+]
+
+ESQUEMA_SQL = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    chave TEXT PRIMARY KEY,
+    linhas INTEGER NOT NULL,
+    ingerido_em TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tarefas (
+    arquivo TEXT NOT NULL,
+    linha INTEGER NOT NULL,            -- posição no DataFrame da planilha
+    id_tarefa INTEGER,
+    tipo TEXT,
+    reaberta INTEGER,                  -- 1 = Sim, 0 = Não
+    criada_em INTEGER,                 -- datas em nanossegundos desde 1970
+    entrega_desejada INTEGER,
+    fechada_em INTEGER,
+    registradas_h REAL,
+    percentual REAL,
+    PRIMARY KEY (arquivo, linha)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tarefas_tipo ON tarefas (arquivo, tipo);
+CREATE INDEX IF NOT EXISTS tarefas_percentual ON tarefas (arquivo, percentual);
+CREATE TABLE IF NOT EXISTS tarefa_responsavel (
+    arquivo TEXT NOT NULL,
+    linha INTEGER NOT NULL,
+    responsavel TEXT
+);
+CREATE INDEX IF NOT EXISTS tarefa_responsavel_nome ON tarefa_responsavel (arquivo, responsavel);
+CREATE TABLE IF NOT EXISTS tarefa_equipe (
+    arquivo TEXT NOT NULL,
+    linha INTEGER NOT NULL,
+    equipe TEXT                        -- NULL = tarefa sem equipe
+);
+CREATE INDEX IF NOT EXISTS tarefa_equipe_nome ON tarefa_equipe (arquivo, equipe);
+"""
+
+_trava = threading.Lock()
+_esquema_criado = False
+# Chaves já confirmadas no banco por este processo
+_ingeridos = set()
+
+
+def ativo():
+    return bool(CAMINHO)
+
+
+def _conectar():
+    global _esquema_criado
+    conexao = sqlite3.connect(CAMINHO, timeout=60, isolation_level=None)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    with _trava:
+        if not _esquema_criado:
+            conexao.executescript(ESQUEMA_SQL)
+            _esquema_criado = True
+    return conexao
+
+
+def contem(chave):
+    """True se a planilha já está no banco."""
+    if not ativo():
+        return False
+    if chave in _ingeridos:
+        return True
+    try:
+        with closing(_conectar()) as conexao:
+            achou = conexao.execute("SELECT 1 FROM arquivos WHERE chave = ?", (chave,)).fetchone()
+    except sqlite3.Error:
+        return False
+    if achou:
+        _ingeridos.add(chave)
+    return bool(achou)
+
+
+def _valores(df, coluna):
+    """Valores da coluna prontos para o sqlite3 (None nas células vazias)."""
+    if coluna not in df.columns:
+        return [None] * len(df)
+    serie = df[coluna]
+    vazias = serie.isna().tolist()
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        valores = serie.to_numpy().view("int64").tolist()
+    elif pd.api.types.is_bool_dtype(serie):
+        valores = [int(v) if not vazia else None for v, vazia in zip(serie.astype(object), vazias)]
+    elif pd.api.types.is_numeric_dtype(serie):
+        valores = serie.astype("float64").tolist()
+    else:
+        valores = [str(v) for v in serie.astype(object)]
+    return [None if vazia else v for v, vazia in zip(valores, vazias)]
+
+
+def _linhas_tarefas(chave, df):
+    colunas = [
+        _valores(df, c) for c in (
+            "ID da Tarefa", "Tipo de tarefa", "Reaberta?", "Criada em",
+            "Entrega desejada", "Fechada em", "Já registradas h", "%",
+        )
+    ]
+    for linha, valores in zip(df.index.tolist(), zip(*colunas)):
+        id_tarefa, tipo, *resto = valores
+        if isinstance(id_tarefa, float) and id_tarefa.is_integer():
+            id_tarefa = int(id_tarefa)
+        yield (chave, linha, id_tarefa, tipo, *resto)
+
+
+def _linhas_itens(chave, df, coluna):
+    if coluna not in df.columns:
+        return [(chave, linha, None) for linha in df.index.tolist()]
+    itens = explodir_multivalorado(df[[coluna]], coluna, "item")["item"]
+    return [(chave, linha, item) for linha, item in zip(itens.index.tolist(), _valores(itens.to_frame(), "item"))]
+
+
+def ingerir(chave, carregar, andamento=None):
+    """Grava a planilha no banco, se ainda não estiver lá.
+
+    `carregar()` devolve o DataFrame tipado (só é chamado se preciso).
+    Devolve True se a planilha está disponível para consulta. `andamento`
+    acompanha a gravação (ver atlantico.segundo_plano).
+    """
+    if not ativo():
+        return False
+    if contem(chave):
+        return True
+
+    def etapa(texto, fracao):
+        if andamento is not None:
+            andamento.etapa(texto, fracao)
+
+    etapa("Lendo a planilha para o banco local…", 0.0)
+    df = carregar()
+    etapa(f"Gravando {len(df):,} tarefas no banco local…".replace(",", "."), 0.2)
+    try:
+        with closing(_conectar()) as conexao:
+            # BEGIN IMMEDIATE: duas sessões com o mesmo arquivo não ingerem em dobro
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                if conexao.execute("SELECT 1 FROM arquivos WHERE chave = ?", (chave,)).fetchone() is None:
+                    conexao.executemany(
+                        "INSERT INTO tarefas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        _linhas_tarefas(chave, df),
+                    )
+                    etapa("Gravando responsáveis e equipes no banco local…", 0.7)
+                    conexao.executemany(
+                        "INSERT INTO tarefa_responsavel VALUES (?, ?, ?)", _linhas_itens(chave, df, "Para")
+                    )
+                    conexao.executemany(
+                        "INSERT INTO tarefa_equipe VALUES (?, ?, ?)", _linhas_itens(chave, df, "Equipe")
+                    )
+                    conexao.execute(
+                        "INSERT INTO arquivos VALUES (?, ?, datetime('now'))", (chave, len(df))
+                    )
+                conexao.execute("COMMIT")
+            except BaseException:
+                conexao.execute("ROLLBACK")
+                raise
+    except sqlite3.Error:
+        return False
+    _ingeridos.add(chave)
+    limpar_antigos()
+    return True
+
+
+def limpar_antigos(max_arquivos=MAX_ARQUIVOS):
+    """Apaga as planilhas ingeridas há mais tempo, e as linhas delas, até sobrarem `max_arquivos`.
+
+    O espaço liberado é reaproveitado pelas próximas ingestões (sem VACUUM).
+    """
+    try:
+        with closing(_conectar()) as conexao:
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                antigos = conexao.execute(
+                    "SELECT chave FROM arquivos ORDER BY ingerido_em DESC, rowid DESC LIMIT -1 OFFSET ?",
+                    (max_arquivos,),
+                ).fetchall()
+                for tabela in ("tarefas", "tarefa_responsavel", "tarefa_equipe"):
+                    conexao.executemany(f"DELETE FROM {tabela} WHERE arquivo = ?", antigos)
+                conexao.executemany("DELETE FROM arquivos WHERE chave = ?", antigos)
+                conexao.execute("COMMIT")
+            except BaseException:
+                conexao.execute("ROLLBACK")
+                raise
+    except sqlite3.Error:
+        return
+    _ingeridos.difference_update(chave for (chave,) in antigos)
+
+
+def consultar(sql, parametros=()):
+    """Executa a consulta e devolve o resultado como DataFrame."""
+    with closing(_conectar()) as conexao:
+        return pd.read_sql_query(sql, conexao, params=parametros)
+
+
+def dia_sql(coluna):
+    """Expressão SQL do início do dia (em ns) da coluna de data, como o floor("D")."""
+    return f"({coluna} - (({coluna} % {DIA_NS}) + {DIA_NS}) % {DIA_NS})"
+
+
+def cubo(sql, parametros=(), dimensao=None):
+    """Cubo diário montado no banco.
+
+    A consulta devolve as colunas dia (ns, ver `dia_sql`), dimensao, n,
+    soma e soma_quadrados, agrupadas por dia e dimensão.
+    """
+    dados = consultar(sql, parametros)
+    dados = pd.DataFrame({
+        "periodo": pd.to_datetime(dados["dia"], unit="ns"),
+        "dimensao": dados["dimensao"].astype(object),
+        "n": dados["n"].astype("int64"),
+        "soma": dados["soma"].astype("float64"),
+        "soma_quadrados": dados["soma_quadrados"].astype("float64"),
+    })
+    return Cubo(dados.sort_values(["periodo", "dimensao"]).reset_index(drop=True), dimensao)
+
+
+def linhas(df, sql, parametros=(), colunas=None):
+    """Linhas de `df` escolhidas no banco: a consulta devolve a coluna `linha`.
+
+    Só as `colunas` de `df` (as que existirem; todas, se None) são
+    copiadas. As demais colunas da consulta substituem (ou se somam a)
+    as de `df`, na ordem das linhas devolvidas; uma linha pode vir mais
+    de uma vez (ex.: uma por equipe).
+    """
+    encontradas = consultar(sql, parametros)
+    posicoes = encontradas.pop("linha").to_numpy()
+    if colunas is not None:
+        df = df[[c for c in colunas if c in df.columns and c not in encontradas.columns]]
+    selecionadas = df.loc[posicoes].reset_index(drop=True)
+    for coluna in encontradas.columns:
+        selecionadas[coluna] = encontradas[coluna].to_numpy()
+    return selecionadas
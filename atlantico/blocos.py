@@ -0,0 +1,109 @@
+"""Leitura do .xlsx em blocos de linhas, com memória limitada.
+
+O `pd.read_excel` monta a planilha inteira como listas de objetos Python
+antes de criar o DataFrame; nas exportações anuais isso estoura a memória
+do servidor compartilhado. Aqui o openpyxl (modo read-only) percorre as
+linhas e cada bloco já sai tipado, então o pico de memória fica em torno
+de um bloco, qualquer que seja o tamanho do arquivo.
+"""
+
+import io
+
+import openpyxl
+import pandas as pd
+import pyarrow as pa
+from openpyxl.cell.cell import ERROR_CODES
+
+from atlantico.esquema import tipar_colunas
+
+TAMANHO_BLOCO = 50_000
+
+
+def nomes_colunas(cabecalho):
+    """Nomeia as colunas como o pandas: 'Unnamed: i' e sufixos '.1', '.2'."""
+    nomes, vistos = [], {}
+    for i, valor in enumerate(cabecalho):
+        nome = f"Unnamed: {i}" if valor is None or valor == "" else str(valor)
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        nomes.append(nome)
+    return nomes
+
+
+def _celula(valor):
+    # Mesmas conversões do leitor openpyxl do pandas
+    if valor == "" or (isinstance(valor, str) and valor in ERROR_CODES):
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def ler_em_blocos(dados, colunas=None, tamanho_bloco=TAMANHO_BLOCO, tipar=True, planilha=0):
+    """Gera DataFrames tipados com até `tamanho_bloco` linhas cada.
+
+    Lê a aba de índice `planilha` (a primeira, como o `pd.read_excel`).
+    Linhas totalmente vazias são descartadas. Com `tipar=False` os blocos
+    saem como lidos, para quem aplica o ESQUEMA por conta própria.
+    """
+    formatos = {}  # formato das datas detectado no primeiro bloco vale para os demais
+    preparar = (lambda df: tipar_colunas(df, formatos)) if tipar else (lambda df: df)
+    livro = openpyxl.load_workbook(io.BytesIO(dados), read_only=True, data_only=True)
+    try:
+        # Mesma numeração de abas do pandas (sheetnames)
+        aba = livro[livro.sheetnames[planilha]]
+        aba.reset_dimensions()
+        linhas = aba.iter_rows(values_only=True)
+
+        nomes = nomes_colunas(next(linhas, ()))
+        pedidas = set(nomes if colunas is None else colunas)
+        indices = [i for i, nome in enumerate(nomes) if nome in pedidas]
+        selecionadas = [nomes[i] for i in indices]
+
+        bloco = []
+        for linha in linhas:
+            if all(_celula(v) is None for v in linha):
+                continue
+            bloco.append([_celula(linha[i]) if i < len(linha) else None for i in indices])
+            if len(bloco) >= tamanho_bloco:
+                yield preparar(pd.DataFrame(bloco, columns=selecionadas))
+                bloco = []
+        if bloco or not selecionadas:
+            yield preparar(pd.DataFrame(bloco, columns=selecionadas))
+    finally:
+        livro.close()
+
+
+def unificar_tabelas(tabelas):
+    """Concatena as tabelas Arrow dos blocos, conciliando os tipos.
+
+    Uma coluna pode sair int64 num bloco e float64 (ou texto) em outro;
+    números misturados viram float64 e o restante vira texto.
+    """
+    tipos = {}
+    for tabela in tabelas:
+        for campo in tabela.schema:
+            if pa.types.is_null(campo.type):
+                continue
+            tipos.setdefault(campo.name, set()).add(campo.type)
+
+    alvo = {}
+    for nome, conjunto in tipos.items():
+        if len(conjunto) == 1:
+            alvo[nome] = conjunto.pop()
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in conjunto):
+            alvo[nome] = pa.float64()
+        else:
+            alvo[nome] = pa.string()
+
+    convertidas = []
+    for tabela in tabelas:
+        esquema = pa.schema(
+            [pa.field(nome, alvo.get(nome, pa.null())) for nome in tabela.column_names],
+            metadata=tabela.schema.metadata,
+        )
+        convertidas.append(tabela.cast(esquema))
+    return pa.concat_tables(convertidas)
@@ -0,0 +1,92 @@
+"""Cache LRU em memória, limitado por número de entradas e por bytes."""
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+def tamanho_em_bytes(valor):
+    """Estimativa do espaço ocupado por um valor guardado no cache."""
+    if hasattr(valor, "memory_usage"):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum()) if hasattr(uso, "sum") else int(uso)
+    if hasattr(valor, "nbytes"):
+        return int(valor.nbytes)
+    if isinstance(valor, (tuple, list)):
+        return sys.getsizeof(valor) + sum(tamanho_em_bytes(v) for v in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_em_bytes(v) for v in valor.values())
+    return sys.getsizeof(valor)
+
+
+class CacheLRU:
+    """Mantém os valores mais recentes dentro de um orçamento de memória.
+
+    As reexecuções do Streamlit rodam em threads diferentes, então todo
+    acesso passa pelo mesmo lock.
+    """
+
+    def __init__(self, max_entradas=8, max_bytes=512 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()  # chave -> (valor, bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    @property
+    def bytes_usados(self):
+        return self._bytes
+
+    def get(self, chave, padrao=None):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return padrao
+            self.acertos += 1
+            self._itens.move_to_end(chave)
+            return item[0]
+
+    def set(self, chave, valor, tamanho=None):
+        if tamanho is None:
+            tamanho = tamanho_em_bytes(valor)
+        with self._lock:
+            if chave in self._itens:
+                self._bytes -= self._itens.pop(chave)[1]
+            # Um valor maior que o orçamento inteiro não é guardado
+            if tamanho > self.max_bytes:
+                return
+            self._itens[chave] = (valor, tamanho)
+            self._bytes += tamanho
+            while len(self._itens) > self.max_entradas or self._bytes > self.max_bytes:
+                _, (_, removido) = self._itens.popitem(last=False)
+                self._bytes -= removido
+
+    def descartar(self, condicao):
+        """Remove as entradas cuja chave satisfaz `condicao(chave)`."""
+        with self._lock:
+            chaves = [chave for chave in self._itens if condicao(chave)]
+            for chave in chaves:
+                self._bytes -= self._itens.pop(chave)[1]
+        return len(chaves)
+
+    def estatisticas(self):
+        return {
+            "entradas": len(self._itens),
+            "bytes": self._bytes,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+        }
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
@@ -0,0 +1,90 @@
+"""Cubos pré-agregados por período para os gráficos de tendência.
+
+Cada cubo guarda, por dia × dimensão (equipe, tipo de tarefa...), a
+contagem, a soma e a soma dos quadrados de uma medida. É montado uma vez
+por arquivo; semana, mês e trimestre saem somando os dias do cubo, sem
+voltar às linhas originais, e média e desvio padrão saem das três somas.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Rótulo -> frequência do pandas (período)
+GRANULARIDADES = {"Semana": "W", "Mês": "M", "Trimestre": "Q"}
+
+MEDIDAS = ["n", "soma", "soma_quadrados"]
+
+
+class Cubo:
+    """Período × dimensão -> n, soma e soma dos quadrados da medida."""
+
+    def __init__(self, dados, dimensao=None, frequencia="D"):
+        self.dados = dados
+        self.dimensao = dimensao
+        self.frequencia = frequencia
+
+    @classmethod
+    def construir(cls, datas, valores, dimensao=None):
+        """Cubo diário de `valores`, aberto pela série `dimensao` (opcional).
+
+        Linhas sem data ou sem valor ficam de fora.
+        """
+        dados = pd.DataFrame({
+            "periodo": pd.to_datetime(datas).dt.floor("D"),
+            "dimensao": dimensao.astype(object) if dimensao is not None else "",
+            "valor": pd.to_numeric(valores, errors="coerce").astype("float64"),
+        }).dropna(subset=["periodo", "valor", "dimensao"])
+        dados["quadrado"] = dados["valor"] ** 2
+        agregado = (
+            dados.groupby(["periodo", "dimensao"], sort=True)
+            .agg(n=("valor", "count"), soma=("valor", "sum"), soma_quadrados=("quadrado", "sum"))
+            .reset_index()
+        )
+        return cls(agregado, dimensao.name if dimensao is not None else None)
+
+    @property
+    def nbytes(self):
+        return int(self.dados.memory_usage(deep=True).sum())
+
+    def agregar(self, frequencia):
+        """Cubo com períodos mais grossos ("W", "M", "Q"), somando os do cubo."""
+        periodo = self.dados["periodo"].dt.to_period(frequencia).dt.start_time
+        dados = (
+            self.dados.assign(periodo=periodo)
+            .groupby(["periodo", "dimensao"], sort=True)[MEDIDAS].sum()
+            .reset_index()
+        )
+        return Cubo(dados, self.dimensao, frequencia)
+
+    def resultado(self):
+        """DataFrame com período, dimensão, n, soma, média e desvio padrão."""
+        df = self.dados.copy()
+        df["media"] = df["soma"] / df["n"]
+        variancia = (df["soma_quadrados"] / df["n"] - df["media"] ** 2).clip(lower=0)
+        df["desvio"] = np.sqrt(variancia)
+        if self.dimensao is None:
+            return df.drop(columns="dimensao")
+        return df.rename(columns={"dimensao": self.dimensao})
+
+
+def escolher_granularidade(chave_widget, padrao="Mês"):
+    return st.selectbox(
+        "Agrupar por", list(GRANULARIDADES),
+        index=list(GRANULARIDADES).index(padrao), key=chave_widget,
+    )
+
+
+def detalhar(resultado, chave_widget, colunas):
+    """Tabela de um período escolhido (drill-down), lida do cubo agregado."""
+    periodos = resultado["periodo"].drop_duplicates().sort_values(ascending=False)
+    if periodos.empty:
+        return
+    periodo = st.selectbox(
+        "Detalhar período", list(periodos),
+        format_func=lambda p: p.strftime("%d/%m/%Y"), key=chave_widget,
+    )
+    st.dataframe(
+        resultado.loc[resultado["periodo"] == periodo, colunas].reset_index(drop=True),
+        use_container_width=True,
+    )
@@ -0,0 +1,133 @@
+"""Conversão das colunas de data da exportação, com o formato detectado.
+
+As datas chegam de três jeitos, conforme quem gerou a planilha: células
+de data (o openpyxl já entrega datetime), números seriais do Excel (dias
+desde 30/12/1899) e texto "dd/mm/aaaa", com ou sem hora. O
+`pd.to_datetime` sem formato testa valor a valor, é lento em colunas de
+objeto, lê seriais como nanossegundos e "03/04/2024" como 4 de março.
+
+Aqui o formato do texto é detectado uma vez, numa amostra, e cada tipo de
+valor é convertido numa única passada vetorizada. As células preenchidas
+que não viram data são contadas.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Dia zero dos números seriais do Excel (sistema de datas 1900)
+ORIGEM_EXCEL = pd.Timestamp("1899-12-30")
+# Seriais aceitos: de 1900 até ~2200 (fora disso não é data, ex.: um ID)
+SERIAL_MINIMO, SERIAL_MAXIMO = 1, 110_000
+
+# Testados em ordem; dia antes do mês, como na exportação
+FORMATOS_TEXTO = [
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%d/%m/%y",
+    "%d-%m-%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d",
+]
+
+TAMANHO_AMOSTRA = 500
+
+
+def detectar_formato(textos):
+    """Formato de FORMATOS_TEXTO que mais converte a amostra, ou None."""
+    amostra = textos.head(TAMANHO_AMOSTRA)
+    melhor, acertos = None, 0
+    for formato in FORMATOS_TEXTO:
+        convertidos = int(pd.to_datetime(amostra, format=formato, errors="coerce").notna().sum())
+        if convertidos > acertos:
+            melhor, acertos = formato, convertidos
+        if acertos == len(amostra):
+            break
+    return melhor
+
+
+def de_serial(numeros):
+    """Números seriais do Excel -> datetime64 (NaT fora da faixa de datas)."""
+    numeros = numeros.astype("float64")
+    dias = numeros.where((numeros >= SERIAL_MINIMO) & (numeros < SERIAL_MAXIMO))
+    return ORIGEM_EXCEL + pd.to_timedelta(dias, unit="D")
+
+
+def _converter_textos(textos, formato):
+    """Textos distintos -> datas, com o formato detectado (ou já conhecido).
+
+    O que não casar com o formato tenta os outros (ex.: datas com e sem
+    hora na mesma coluna), depois o leitor genérico do pandas (dia antes
+    do mês) e, por fim, número serial escrito como texto.
+    """
+    if formato is None:
+        formato = detectar_formato(textos)
+    datas = pd.Series(pd.NaT, index=textos.index, dtype="datetime64[ns]")
+    sobra = textos
+    for tentativa in [formato] + [f for f in FORMATOS_TEXTO if f != formato]:
+        if tentativa is None or sobra.empty:
+            continue
+        datas.loc[sobra.index] = pd.to_datetime(sobra, format=tentativa, errors="coerce")
+        sobra = sobra[datas.loc[sobra.index].isna()]
+    # Formatos fora da lista (ex.: "2024/01/03", "03.04.2024"); números
+    # ficam para o serial, que o leitor genérico leria como ano
+    numeros = pd.to_numeric(sobra, errors="coerce")
+    texto_livre = sobra[numeros.isna()]
+    if not texto_livre.empty:
+        datas.loc[texto_livre.index] = pd.to_datetime(texto_livre, errors="coerce", dayfirst=True, format="mixed")
+    datas.loc[numeros.index[numeros.notna()]] = de_serial(numeros.dropna())
+    return datas, formato
+
+
+def converter_datas(serie, formato=None):
+    """Devolve (datas, células inválidas, formato do texto).
+
+    `formato` é o formato do texto já detectado (ex.: no bloco anterior);
+    se None e houver texto, é detectado aqui.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie, 0, formato
+    preenchidas = serie.notna()
+    if pd.api.types.is_numeric_dtype(serie):
+        datas = de_serial(serie)
+        return datas, int((preenchidas & datas.isna()).sum()), formato
+    tipo = pd.api.types.infer_dtype(serie, skipna=True)
+    if tipo in ("datetime", "datetime64", "date", "empty"):
+        datas = pd.to_datetime(serie, errors="coerce")
+        return datas, int((preenchidas & datas.isna()).sum()), formato
+
+    datas = pd.Series(pd.NaT, index=serie.index, dtype="datetime64[ns]")
+    if tipo == "string":
+        # Só texto (o caso comum): as preenchidas são os textos
+        eh_texto = preenchidas.copy()
+    else:
+        # Coluna mista: máscara por tipo (o acessor .str falha em objetos sem texto)
+        eh_texto = serie.map(lambda valor: isinstance(valor, str)).astype(bool)
+    textos = serie[eh_texto].astype(str).str.strip()
+    # Texto só com espaços conta como célula vazia
+    preenchidas &= ~(textos == "").reindex(serie.index, fill_value=False)
+
+    textos = textos[textos != ""]
+    if not textos.empty:
+        # Datas se repetem muito: cada texto distinto é convertido uma vez
+        codigos, unicos = pd.factorize(textos)
+        convertidos, formato = _converter_textos(pd.Series(unicos), formato)
+        datas.loc[textos.index] = convertidos.to_numpy()[codigos]
+
+    if tipo == "string":
+        return datas, int((preenchidas & datas.isna()).sum()), formato
+
+    # Números (seriais) e objetos de data
+    outros = serie[preenchidas & ~eh_texto]
+    # Booleanos não são seriais (True viraria 31/12/1899)
+    logicos = outros.map(lambda valor: isinstance(valor, (bool, np.bool_))).astype(bool)
+    numeros = pd.to_numeric(outros.mask(logicos), errors="coerce")
+    datas.loc[numeros.index] = de_serial(numeros)
+    objetos = outros[numeros.isna()]
+    if not objetos.empty:
+        datas.loc[objetos.index] = pd.to_datetime(objetos, errors="coerce")
+
+    return datas, int((preenchidas & datas.isna()).sum()), formato
@@ -0,0 +1,68 @@
+"""Colunas conhecidas da exportação de tarefas e seus tipos.
+
+Depois do `pd.read_excel` todo texto é objeto Python. Aqui cada coluna
+conhecida recebe o tipo mais compacto que a representa: categorias para
+os campos repetitivos, booleano anulável para "Reaberta?", float32 para
+as horas/percentuais e datetime64 para as datas (ver atlantico.datas).
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+from atlantico.datas import converter_datas
+from atlantico.perfil import medir
+
+COLUNAS_DATA = ["Criada em", "Fechada em", "Entrega desejada"]
+COLUNAS_NUMERICAS = ["Já registradas h", "%"]
+COLUNAS_CATEGORICAS = ["Equipe", "Para", "Tipo de tarefa"]
+COLUNAS_BOOLEANAS = {"Reaberta?": {"Sim": True, "Não": False}}
+
+# Em df.attrs: coluna de data -> células preenchidas que não viraram data
+DATAS_INVALIDAS = "datas_invalidas"
+
+ESQUEMA = {
+    **{coluna: pa.timestamp("ns") for coluna in COLUNAS_DATA},
+    **{coluna: pa.float32() for coluna in COLUNAS_NUMERICAS},
+    **{coluna: pa.dictionary(pa.int32(), pa.string()) for coluna in COLUNAS_CATEGORICAS},
+    **{coluna: pa.bool_() for coluna in COLUNAS_BOOLEANAS},
+}
+
+
+def texto_ou_nulo(serie):
+    """Converte os valores para str, preservando as células vazias."""
+    return serie.where(serie.isna(), serie.astype(str))
+
+
+def sim_nao(serie):
+    """Volta uma coluna booleana para os rótulos "Sim"/"Não" da exportação."""
+    return serie.map({True: "Sim", False: "Não"}).astype(object)
+
+
+def memoria(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+@medir("coercao")
+def tipar_colunas(df, formatos=None):
+    """Aplica o ESQUEMA às colunas presentes no DataFrame.
+
+    `formatos` (coluna -> formato do texto das datas) guarda os formatos
+    detectados entre chamadas, ex.: de um bloco para o seguinte. As datas
+    não reconhecidas ficam contadas em `df.attrs[DATAS_INVALIDAS]`.
+    """
+    formatos = {} if formatos is None else formatos
+    invalidas = {}
+    for coluna in COLUNAS_DATA:
+        if coluna in df.columns:
+            df[coluna], invalidas[coluna], formatos[coluna] = converter_datas(df[coluna], formatos.get(coluna))
+    for coluna in COLUNAS_NUMERICAS:
+        if coluna in df.columns:
+            df[coluna] = pd.to_numeric(df[coluna], errors="coerce").astype("float32")
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns and not isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            df[coluna] = texto_ou_nulo(df[coluna]).astype("category")
+    for coluna, valores in COLUNAS_BOOLEANAS.items():
+        if coluna in df.columns and df[coluna].dtype == object:
+            df[coluna] = df[coluna].map(valores).astype("boolean")
+    df.attrs[DATAS_INVALIDAS] = invalidas
+    return df
@@ -0,0 +1,83 @@
+"""Figuras Plotly guardadas pelo hash dos dados agregados e da configuração.
+
+Montar um `px.bar`/`px.pie` passa pela validação completa do Plotly; com a
+figura pronta no cache, o `st.plotly_chart` só faz a serialização. A
+medição separa o tempo gasto construindo figuras do tempo de envio.
+"""
+
+import hashlib
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from atlantico.cache import CacheLRU
+from atlantico.perfil import etapa
+
+_figuras = CacheLRU(max_entradas=128, max_bytes=64 * 1024 * 1024)
+
+# Medição da reexecução atual (cada reexecução roda na sua própria thread)
+_local = threading.local()
+
+
+def hash_dados(df):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def tamanho_figura(fig):
+    """Espaço da figura no cache: o tamanho do JSON que ela gera.
+
+    Os dados viram arrays e textos dentro dos traces, então o tamanho não
+    acompanha o do DataFrame agregado (ex.: rótulos de texto em cada barra).
+    """
+    return len(fig.to_json())
+
+
+def reiniciar_medicao():
+    _local.medicao = {"construidas": 0, "reaproveitadas": 0, "construcao_s": 0.0, "exibicao_s": 0.0}
+
+
+def medicao():
+    if not hasattr(_local, "medicao"):
+        reiniciar_medicao()
+    return _local.medicao
+
+
+def figura(dados, construir, **config):
+    """Devolve `construir(dados, **config)`, construída uma vez por dados/config.
+
+    A figura devolvida é compartilhada: não deve ser alterada depois.
+    """
+    item = (
+        hash_dados(dados),
+        f"{construir.__module__}.{construir.__qualname__}",
+        repr(sorted(config.items())),
+    )
+    fig = _figuras.get(item)
+    if fig is None:
+        inicio = time.perf_counter()
+        with etapa(f"figura.{construir.__name__}"):
+            fig = construir(dados, **config)
+        medicao()["construcao_s"] += time.perf_counter() - inicio
+        medicao()["construidas"] += 1
+        _figuras.set(item, fig, tamanho=tamanho_figura(fig))
+    else:
+        medicao()["reaproveitadas"] += 1
+    return fig
+
+
+def exibir_figura(dados, construir, **config):
+    """`st.plotly_chart` da figura em cache, medindo o tempo de envio."""
+    fig = figura(dados, construir, **config)
+    inicio = time.perf_counter()
+    with etapa("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    medicao()["exibicao_s"] += time.perf_counter() - inicio
+
+
+def estatisticas():
+    return _figuras.estatisticas()
@@ -0,0 +1,232 @@
+"""Modo incremental: exportações diárias comparadas pelo "ID da Tarefa".
+
+Cada exportação costuma ser a anterior mais algumas tarefas novas ou
+alteradas. Em vez de recalcular os agregados por equipe, por pessoa e por
+tipo a cada upload, a nova planilha é comparada com a base anterior pela
+assinatura (hash) de cada linha e só as tarefas inseridas, alteradas e
+removidas entram ou saem dos agregadores.
+
+A base fica em disco (ao lado das cópias Arrow, uma por exportação, com
+um ponteiro para a última), então uma nova sessão compara o upload com a
+exportação anterior em vez de começar do zero. Enquanto a base estiver
+sincronizada com o arquivo aberto, as análises leem dela os agregados
+(ex.: horas por tipo de tarefa) em vez de agrupar a planilha de novo.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import streamlit as st
+
+from atlantico import sidecar
+from atlantico.agregacao import AgregadorIncremental
+from atlantico.ingestao import carregar_planilha, chave_arquivo
+from atlantico.plano import HORAS
+
+COLUNA_ID = "ID da Tarefa"
+
+# nome -> (rótulo, parâmetros do AgregadorIncremental)
+AGREGADOS = {
+    "equipe": ("Por equipe", dict(chave="Equipe", multivalorado=True)),
+    "pessoa": ("Por pessoa", dict(chave="Para", multivalorado=True)),
+    "tipo": ("Por tipo de tarefa", dict(chave="Tipo de tarefa", valor="Já registradas h")),
+}
+
+COLUNAS = [COLUNA_ID] + sorted(
+    {c for _, parametros in AGREGADOS.values() for c in (parametros["chave"], parametros.get("valor")) if c}
+)
+
+Diferenca = namedtuple("Diferenca", ["inseridas", "atualizadas", "removidas"])
+
+# String vazia (cópias em disco desligadas) deixa a base só na sessão
+DIRETORIO = os.path.join(sidecar.DIRETORIO, "incremental") if sidecar.DIRETORIO else ""
+# Arquivo com a chave da última base gravada
+PONTEIRO = "ultima"
+COLUNA_ASSINATURA = "__assinatura"
+# Metadados da base: chave do arquivo e se nenhuma linha foi descartada
+CHAVE_BASE = b"atlantico.incremental"
+
+
+def assinaturas(df):
+    """Hash de cada linha, indexado pelo ID da tarefa."""
+    return pd.Series(
+        pd.util.hash_pandas_object(df, index=False).to_numpy(),
+        index=pd.Index(df[COLUNA_ID].to_numpy(), name=COLUNA_ID),
+    )
+
+
+def diferenca(anteriores, novas):
+    """IDs inseridos, alterados e removidos entre duas `assinaturas`."""
+    comuns = novas.index.intersection(anteriores.index)
+    mudou = novas.loc[comuns].to_numpy() != anteriores.loc[comuns].to_numpy()
+    return Diferenca(
+        inseridas=novas.index.difference(anteriores.index),
+        atualizadas=comuns[mudou],
+        removidas=anteriores.index.difference(novas.index),
+    )
+
+
+def _normalizar(df):
+    # Uma linha por ID (a última vence), sem IDs vazios; horas como número
+    df = df.dropna(subset=[COLUNA_ID])
+    df = df.drop_duplicates(COLUNA_ID, keep="last").reset_index(drop=True)
+    if HORAS.nome in df.columns:
+        df = df.assign(**{HORAS.nome: HORAS.calcular(df)})
+    return df
+
+
+def _caminho(chave):
+    return os.path.join(DIRETORIO, f"{chave}.arrow")
+
+
+def _ler_base():
+    """(chave, df, assinaturas, completa) da última base em disco, ou None."""
+    if not DIRETORIO:
+        return None
+    try:
+        with open(os.path.join(DIRETORIO, PONTEIRO), encoding="utf-8") as ponteiro:
+            chave = ponteiro.read().strip()
+        tabela = feather.read_table(_caminho(chave))
+    except (OSError, pa.ArrowInvalid):
+        return None
+    metadados = json.loads((tabela.schema.metadata or {}).get(CHAVE_BASE, b"{}"))
+    if metadados.get("chave") != chave:
+        return None
+    df = sidecar.para_pandas(tabela)
+    novas = pd.Series(
+        df.pop(COLUNA_ASSINATURA).to_numpy(dtype="uint64"),
+        index=pd.Index(df[COLUNA_ID].to_numpy(), name=COLUNA_ID),
+    )
+    return chave, df, novas, metadados.get("completa", False)
+
+
+def _gravar_ponteiro(temporario, chave):
+    with open(temporario, "w", encoding="utf-8") as ponteiro:
+        ponteiro.write(chave)
+
+
+def _gravar_base(chave, df, novas, completa, anterior):
+    """Grava a base e aponta para ela; a base anterior é apagada."""
+    if not DIRETORIO:
+        return
+    tabela = sidecar.para_arrow(df, list(df.columns))
+    tabela = tabela.append_column(COLUNA_ASSINATURA, pa.array(novas.to_numpy(), type=pa.uint64()))
+    tabela = tabela.replace_schema_metadata({
+        CHAVE_BASE: json.dumps({"chave": chave, "completa": completa}).encode(),
+    })
+    try:
+        sidecar.substituir(_caminho(chave), lambda t: feather.write_feather(tabela, t, compression="uncompressed"))
+        sidecar.substituir(os.path.join(DIRETORIO, PONTEIRO), lambda t: _gravar_ponteiro(t, chave))
+        if anterior and anterior != chave:
+            os.remove(_caminho(anterior))
+    except OSError:
+        pass
+
+
+class BaseIncremental:
+    """Última exportação sincronizada e os agregados correspondentes."""
+
+    def __init__(self):
+        self.chave = None
+        self.df = None
+        self._assinaturas = None
+        # True se a base tem todas as linhas do arquivo (nenhum ID vazio ou repetido)
+        self.completa = False
+        self.agregadores = {}
+
+    @classmethod
+    def carregar(cls):
+        """Base gravada pela última sincronização (de qualquer sessão), ou vazia."""
+        base = cls()
+        gravada = _ler_base()
+        if gravada is not None:
+            base.chave, base.df, base._assinaturas, base.completa = gravada
+            base._reconstruir(base.df)
+        return base
+
+    def _reconstruir(self, df):
+        self.agregadores = {
+            nome: AgregadorIncremental(**parametros) for nome, (_, parametros) in AGREGADOS.items()
+        }
+        for agregador in self.agregadores.values():
+            agregador.atualizar(df)
+
+    def sincronizar(self, chave, df):
+        """Aplica a nova exportação e devolve a Diferenca (None se é a mesma)."""
+        if chave == self.chave:
+            return None
+        linhas = len(df)
+        df = _normalizar(df)
+        novas = assinaturas(df)
+
+        if self.df is None or list(df.columns) != list(self.df.columns):
+            self._reconstruir(df)
+            delta = Diferenca(novas.index, novas.index[:0], novas.index[:0])
+        else:
+            delta = diferenca(self._assinaturas, novas)
+            saem = delta.atualizadas.union(delta.removidas)
+            entram = delta.atualizadas.union(delta.inseridas)
+            saindo = self.df[self.df[COLUNA_ID].isin(saem)]
+            entrando = df[df[COLUNA_ID].isin(entram)]
+            for agregador in self.agregadores.values():
+                agregador.remover(saindo)
+                agregador.atualizar(entrando)
+
+        anterior = self.chave
+        self.chave, self.df, self._assinaturas = chave, df, novas
+        self.completa = len(df) == linhas
+        _gravar_base(chave, df, novas, self.completa, anterior)
+        return delta
+
+    def resultados(self):
+        return {nome: agregador.resultado() for nome, agregador in self.agregadores.items()}
+
+
+def agregado(chave, nome):
+    """Resultado do agregado `nome` se a base da sessão é a do arquivo `chave`.
+
+    None quando o modo incremental não sincronizou este arquivo (ou uma
+    janela dele) ou quando a base descartou linhas (IDs vazios ou
+    repetidos), casos em que o agregado não bate com a planilha. Lê o
+    session_state: chamar na thread do script, não em segundo plano.
+    """
+    base = st.session_state.get("base_incremental")
+    if base is None or base.chave != chave or not base.completa or nome not in base.agregadores:
+        return None
+    return base.agregadores[nome].resultado()
+
+
+# ===================================================================
+# =====================  M O D O   I N C R E M E N T A L  ============
+# ===================================================================
+def exibir(arquivo):
+    """Sincroniza a base com o arquivo e mostra os agregados."""
+    df = carregar_planilha(arquivo, colunas=COLUNAS)
+    if COLUNA_ID not in df.columns:
+        st.warning(f"O modo incremental precisa da coluna '{COLUNA_ID}'.")
+        return
+
+    if "base_incremental" not in st.session_state:
+        st.session_state.base_incremental = BaseIncremental.carregar()
+    base = st.session_state.base_incremental
+
+    delta = base.sincronizar(chave_arquivo(arquivo), df)
+    if delta is not None:
+        st.session_state.ultima_diferenca = delta
+    # Mesmo arquivo da base gravada: nada mudou desde a última sincronização
+    vazio = pd.Index([])
+    delta = st.session_state.get("ultima_diferenca", Diferenca(vazio, vazio, vazio))
+
+    with st.expander("🔄 Atualização incremental", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Inseridas", len(delta.inseridas))
+        col2.metric("Atualizadas", len(delta.atualizadas))
+        col3.metric("Removidas", len(delta.removidas))
+
+        for nome, resultado in base.resultados().items():
+            st.markdown(f"**{AGREGADOS[nome][0]}**")
+            st.dataframe(resultado.sort_values("total", ascending=False), use_container_width=True)
@@ -0,0 +1,129 @@
+"""Índice tarefa <-> pessoa/equipe montado uma vez por arquivo.
+
+As listas de responsáveis e equipes viram códigos inteiros; para cada
+código, `offsets` delimita (no estilo CSR) o trecho de `linhas` com as
+posições das linhas daquela entidade. Filtrar por uma pessoa custa
+O(linhas encontradas) em vez de varrer o DataFrame, e a contagem por
+entidade é só a diferença entre offsets consecutivos.
+
+`IndiceDatas` faz o mesmo para janelas de tempo (filtro de período).
+"""
+
+import numpy as np
+import pandas as pd
+
+from atlantico.cache import CacheLRU, tamanho_em_bytes
+from atlantico.perfil import etapa
+from atlantico.resultados import deriva_de
+
+# (chave do arquivo, nome) -> (DataFrame, IndiceAtribuicao) ou IndiceDatas
+_indices = CacheLRU(max_entradas=32, max_bytes=256 * 1024 * 1024)
+
+
+class IndiceAtribuicao:
+    def __init__(self, rotulos, linhas, offsets):
+        self.rotulos = rotulos
+        self.linhas = linhas
+        self.offsets = offsets
+        self._codigos = {rotulo: i for i, rotulo in enumerate(rotulos)}
+
+    @classmethod
+    def construir(cls, serie):
+        """Indexa uma coluna com um rótulo por linha (valores nulos ficam de fora)."""
+        codigos, rotulos = pd.factorize(serie, sort=True)
+        validas = np.flatnonzero(codigos >= 0)
+        codigos = codigos[validas]
+        linhas = validas[np.argsort(codigos, kind="stable")]
+        offsets = np.zeros(len(rotulos) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codigos, minlength=len(rotulos)), out=offsets[1:])
+        return cls(np.asarray(rotulos, dtype=object), linhas, offsets)
+
+    def __len__(self):
+        return len(self.rotulos)
+
+    @property
+    def nbytes(self):
+        return self.rotulos.nbytes + self.linhas.nbytes + self.offsets.nbytes
+
+    def posicoes(self, rotulo):
+        """Posições (em ordem crescente) das linhas do rótulo."""
+        codigo = self._codigos.get(rotulo)
+        if codigo is None:
+            return self.linhas[:0]
+        return self.linhas[self.offsets[codigo]:self.offsets[codigo + 1]]
+
+    def contagens(self):
+        """Número de linhas por rótulo, em ordem alfabética."""
+        return pd.Series(np.diff(self.offsets), index=pd.Index(self.rotulos))
+
+
+class IndiceDatas:
+    """Linhas com data (NaT fica de fora) em ordem crescente da data.
+
+    A janela [inicio, fim) é um trecho contíguo de `ordem`, achado por
+    busca binária: O(log n) e um `df.take` só das linhas da janela, sem
+    máscara booleana sobre todas as linhas nem cópia ordenada do arquivo.
+    """
+
+    def __init__(self, ordem, valores):
+        self.ordem = ordem
+        self.valores = valores
+
+    @classmethod
+    def construir(cls, serie):
+        valores = serie.to_numpy(dtype="datetime64[ns]")
+        validas = np.flatnonzero(~np.isnat(valores))
+        ordem = validas[np.argsort(valores[validas], kind="stable")]
+        return cls(ordem, valores[ordem])
+
+    def __len__(self):
+        return len(self.ordem)
+
+    @property
+    def nbytes(self):
+        return self.ordem.nbytes + self.valores.nbytes
+
+    def limites(self):
+        """(menor, maior) data, ou (None, None) sem nenhuma data."""
+        if not len(self):
+            return None, None
+        return pd.Timestamp(self.valores[0]), pd.Timestamp(self.valores[-1])
+
+    def intervalo(self, inicio=None, fim=None):
+        """(lo, hi): posições em `ordem` com inicio <= data < fim."""
+        lo = 0 if inicio is None else int(np.searchsorted(self.valores, np.datetime64(inicio, "ns"), "left"))
+        hi = len(self) if fim is None else int(np.searchsorted(self.valores, np.datetime64(fim, "ns"), "left"))
+        return lo, max(lo, hi)
+
+
+def indice_datas(chave, df, coluna):
+    """IndiceDatas de `coluna` no arquivo `chave`, montado uma vez."""
+    item_chave = (chave, "datas", coluna)
+    indice = _indices.get(item_chave)
+    if indice is None:
+        with etapa(f"indice.datas.{coluna}"):
+            indice = IndiceDatas.construir(df[coluna])
+        _indices.set(item_chave, indice, tamanho=indice.nbytes)
+    return indice
+
+
+def tabela_indexada(chave, nome, montar, coluna):
+    """Devolve (DataFrame, índice de `coluna`), montados uma vez por arquivo.
+
+    `montar()` só é chamada na primeira vez para a chave do arquivo; o
+    DataFrame devolvido é compartilhado entre as reexecuções e não deve
+    ser alterado.
+    """
+    item = _indices.get((chave, nome))
+    if item is None:
+        df = montar()
+        with etapa(f"indice.{nome}"):
+            indice = IndiceAtribuicao.construir(df[coluna])
+        item = (df, indice)
+        _indices.set((chave, nome), item, tamanho=tamanho_em_bytes(df) + indice.nbytes)
+    return item
+
+
+def descartar(chave):
+    """Remove os índices do arquivo `chave` (e das janelas de período dele)."""
+    return _indices.descartar(lambda item: deriva_de(item[0], chave))
@@ -0,0 +1,342 @@
+"""Leitura das planilhas exportadas, com cache pelo hash do conteúdo.
+
+Cada interação no Streamlit reexecuta o script inteiro; sem cache, o
+workbook seria processado de novo pelo openpyxl a cada clique. Há dois
+níveis: o DataFrame em memória (um por conteúdo, compartilhado pelas
+sessões; ver atlantico.registro) e a cópia Arrow em disco (sidecar), que
+sobrevive ao fim da sessão e é compartilhada entre os dashboards.
+
+Cada análise declara as colunas de que precisa pelo nome; só essas são
+processadas. Quando outra análise pede colunas novas do mesmo arquivo, a
+leitura é refeita com a união das colunas e o sidecar é substituído.
+
+Vários arquivos (e várias abas) formam um único conjunto de dados; cada
+aba tem o seu sidecar e as que faltam converter são processadas em
+paralelo, em processos separados.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from atlantico import registro, sidecar
+from atlantico.blocos import ler_em_blocos, unificar_tabelas
+from atlantico.cache import CacheLRU
+from atlantico.perfil import etapa
+from atlantico.esquema import DATAS_INVALIDAS, memoria, tipar_colunas
+
+# Acima deste tamanho o .xlsx é lido em blocos (ver atlantico.blocos)
+LIMITE_LEITURA_EM_BLOCOS = 8 * 1024 * 1024
+# Abaixo deste total de bytes a converter, iniciar processos não compensa
+LIMITE_PROCESSOS = 4 * 1024 * 1024
+
+# Chave da deduplicação entre arquivos/abas
+COLUNA_ID = "ID da Tarefa"
+# Entre linhas com o mesmo ID vale a de data mais recente, nesta ordem
+COLUNAS_RECENCIA = ["Fechada em", "Criada em"]
+
+# file_id do upload do Streamlit -> chave, para não refazer o hash a cada clique
+_chaves = CacheLRU(max_entradas=64)
+
+# chave do arquivo -> índices das abas com tarefas
+_abas = CacheLRU(max_entradas=64)
+
+
+def chave_conteudo(dados):
+    """Hash estável do conteúdo enviado (independe do nome do arquivo)."""
+    return hashlib.blake2b(dados, digest_size=16).hexdigest()
+
+
+def chave_arquivo(arquivo):
+    """Chave de conteúdo do arquivo enviado (ou dos bytes, ou de uma lista)."""
+    if isinstance(arquivo, (list, tuple)):
+        # Ordenadas: a mesma seleção de arquivos tem a mesma chave em qualquer ordem
+        chaves = sorted(chave_arquivo(a) for a in arquivo)
+        return chaves[0] if len(chaves) == 1 else chave_conteudo("|".join(chaves).encode())
+    file_id = getattr(arquivo, "file_id", None)
+    chave = _chaves.get(file_id) if file_id else None
+    if chave is None:
+        chave = chave_conteudo(ler_bytes(arquivo))
+        if file_id:
+            _chaves.set(file_id, chave, tamanho=0)
+    return chave
+
+
+def ler_bytes(arquivo):
+    if isinstance(arquivo, (bytes, bytearray)):
+        return bytes(arquivo)
+    if hasattr(arquivo, "getvalue"):
+        return arquivo.getvalue()
+    arquivo.seek(0)
+    return arquivo.read()
+
+
+def ler_cabecalho(dados, planilha=0):
+    """Nomes das colunas da planilha, lendo apenas a linha de cabeçalho."""
+    return [str(c) for c in pd.read_excel(io.BytesIO(dados), sheet_name=planilha, nrows=0).columns]
+
+
+def abas_de_tarefas(chave, dados):
+    """Índices das abas com tarefas: as que têm a coluna COLUNA_ID.
+
+    Sem nenhuma aba assim, vale só a primeira (como o `pd.read_excel`).
+    O número de abas vem do workbook.xml, sem abrir o livro inteiro.
+    """
+    abas = _abas.get(chave)
+    if abas is not None:
+        return abas
+    try:
+        with zipfile.ZipFile(io.BytesIO(dados)) as pacote:
+            total = len(re.findall(rb"<(?:\w+:)?sheet\b", pacote.read("xl/workbook.xml")))
+    except (zipfile.BadZipFile, KeyError):
+        total = 1
+    abas = [0]
+    if total > 1:
+        with pd.ExcelFile(io.BytesIO(dados)) as livro:
+            abas = [
+                i for i, nome in enumerate(livro.sheet_names)
+                if COLUNA_ID in [str(c) for c in livro.parse(nome, nrows=0).columns]
+            ] or [0]
+    _abas.set(chave, abas, tamanho=0)
+    return abas
+
+
+def resolver_colunas(cabecalho, colunas=None):
+    """Colunas pedidas que existem na planilha, na ordem do arquivo.
+
+    Nomes ausentes são ignorados: cada análise já verifica as colunas
+    obrigatórias e mostra a mensagem de erro adequada.
+    """
+    if colunas is None:
+        return list(cabecalho)
+    pedidas = set(colunas)
+    return [c for c in cabecalho if c in pedidas]
+
+
+def converter_planilha(dados, cabecalho, colunas, planilha=0, andamento=None):
+    """Processa só as colunas pedidas do .xlsx e devolve a tabela Arrow.
+
+    A memória ocupada antes e depois da tipagem e as datas não
+    reconhecidas ficam nos metadados da tabela (ver `memoria_planilha` e
+    `datas_invalidas_planilha`). `andamento` (ver
+    atlantico.segundo_plano) recebe as linhas à medida que são lidas.
+    """
+    desejadas = set(colunas)
+    antes = depois = 0
+    invalidas = {}
+    if len(dados) > LIMITE_LEITURA_EM_BLOCOS:
+        tabelas = []
+        formatos = {}
+        with etapa("read_excel.blocos"):
+            for bloco in ler_em_blocos(dados, desejadas, tipar=False, planilha=planilha):
+                antes += memoria(bloco)
+                bloco = tipar_colunas(bloco, formatos)
+                depois += memoria(bloco)
+                for coluna, n in bloco.attrs[DATAS_INVALIDAS].items():
+                    invalidas[coluna] = invalidas.get(coluna, 0) + n
+                tabelas.append(sidecar.para_arrow(bloco, cabecalho))
+                if andamento is not None:
+                    andamento.linhas(bloco)
+                    andamento.etapa(f"Lendo a planilha… {andamento.registros:,} linhas".replace(",", "."))
+            tabela = unificar_tabelas(tabelas)
+    else:
+        with etapa("read_excel"):
+            df = pd.read_excel(
+                io.BytesIO(dados), sheet_name=planilha, usecols=lambda nome: str(nome) in desejadas
+            )
+        antes = memoria(df)
+        df = tipar_colunas(df)
+        depois = memoria(df)
+        invalidas = df.attrs[DATAS_INVALIDAS]
+        tabela = sidecar.para_arrow(df, cabecalho)
+        if andamento is not None:
+            andamento.linhas(df)
+    tabela = sidecar.anotar_datas_invalidas(tabela, invalidas)
+    return sidecar.anotar_memoria(tabela, antes, depois)
+
+
+def _converter(argumentos):
+    # Ponto de entrada dos processos do pool (precisa ser importável)
+    return converter_planilha(*argumentos)
+
+
+def _converter_varias(pendentes, andamento=None):
+    """Converte as abas pendentes; várias e grandes vão para um pool de processos.
+
+    O openpyxl é Python puro e preso ao GIL, então threads não ajudam.
+    """
+    argumentos = [(dados, cabecalho, desejadas, aba) for _, dados, aba, cabecalho, desejadas in pendentes]
+    tabelas = [None] * len(argumentos)
+
+    def concluida(i, tabela):
+        tabelas[i] = tabela
+        if andamento is not None:
+            prontas = sum(t is not None for t in tabelas)
+            andamento.etapa(f"{prontas} de {len(tabelas)} planilhas lidas", prontas / len(tabelas))
+
+    if len(argumentos) > 1 and sum(len(a[0]) for a in argumentos) > LIMITE_PROCESSOS:
+        trabalhadores = min(len(argumentos), os.cpu_count() or 1)
+        with etapa("read_excel.processos"):
+            with ProcessPoolExecutor(trabalhadores, mp_context=multiprocessing.get_context("spawn")) as pool:
+                futuros = {pool.submit(_converter, a): i for i, a in enumerate(argumentos)}
+                for futuro in as_completed(futuros):
+                    tabela = futuro.result()
+                    if andamento is not None:
+                        andamento.tabela(tabela)
+                    concluida(futuros[futuro], tabela)
+    else:
+        for i, a in enumerate(argumentos):
+            concluida(i, converter_planilha(*a, andamento=andamento))
+    return tabelas
+
+
+def _carregar(partes, colunas, atual, andamento=None):
+    """Obtém do sidecar ou do .xlsx as colunas pedidas mais as já carregadas.
+
+    `partes` lista (chave, bytes, aba) de cada aba; devolve um
+    (cabeçalho, df) por parte, na mesma ordem.
+    """
+    ja_carregadas = set(atual.columns) if atual is not None else set()
+    prontas, pendentes = {}, []
+
+    for chave, dados, aba in partes:
+        esquema = sidecar.ler_esquema(chave)
+        if esquema is not None:
+            cabecalho = sidecar.cabecalho(esquema)
+            desejadas = set(resolver_colunas(cabecalho, colunas)) | (ja_carregadas & set(cabecalho))
+            if desejadas <= set(esquema.names):
+                with etapa("sidecar"):
+                    tabela = sidecar.ler(chave, resolver_colunas(cabecalho, desejadas))
+                    if tabela is not None:
+                        prontas[chave] = cabecalho, sidecar.para_pandas(tabela)
+                        if andamento is not None:
+                            andamento.linhas(prontas[chave][1])
+                        continue
+            desejadas |= set(esquema.names)
+        else:
+            cabecalho = ler_cabecalho(dados, aba)
+            desejadas = set(resolver_colunas(cabecalho, colunas)) | (ja_carregadas & set(cabecalho))
+        pendentes.append((chave, dados, aba, cabecalho, desejadas))
+
+    for (chave, _, _, cabecalho, _), tabela in zip(pendentes, _converter_varias(pendentes, andamento)):
+        sidecar.gravar(chave, tabela)
+        prontas[chave] = cabecalho, sidecar.para_pandas(tabela)
+
+    return [prontas[chave] for chave, _, _ in partes]
+
+
+def _juntar(resultados):
+    """Concatena as abas/arquivos, uma linha por ID da Tarefa.
+
+    Entre as repetidas fica a de data mais recente (COLUNAS_RECENCIA); no
+    empate, a da última parte (as partes vêm ordenadas pela chave).
+    """
+    if len(resultados) == 1:
+        return resultados[0]
+
+    cabecalho = list(dict.fromkeys(c for cab, _ in resultados for c in cab))
+    # Colunas ausentes numa parte entram vazias com o tipo das outras partes
+    tipos = {}
+    for _, df in resultados:
+        for coluna in df.columns:
+            tipos.setdefault(coluna, df[coluna].dtype)
+    quadros = []
+    for _, df in resultados:
+        faltando = {
+            c: t for c, t in tipos.items()
+            if c not in df.columns and not pd.api.types.is_integer_dtype(t)
+        }
+        quadros.append(df.reindex(columns=list(tipos)).astype(faltando))
+    # Categorias diferentes entre as partes viram texto no concat; tipar de novo
+    df = tipar_colunas(pd.concat(quadros, ignore_index=True))
+
+    if COLUNA_ID in df.columns:
+        datas = [c for c in COLUNAS_RECENCIA if pd.api.types.is_datetime64_any_dtype(df.get(c))]
+        # Ordenação estável: sem data (NaT) primeiro, a mais recente por último
+        ordenado = df.sort_values(datas, na_position="first", kind="stable") if datas else df
+        repetidas = ordenado[COLUNA_ID].notna() & ordenado.duplicated(COLUNA_ID, keep="last")
+        df = df.drop(index=ordenado.index[repetidas.to_numpy()]).reset_index(drop=True)
+    return cabecalho, df
+
+
+def _partes(arquivos):
+    # Arquivos pela chave do conteúdo: o resultado não depende da ordem do upload
+    partes = []
+    for chave, arquivo in sorted(((chave_arquivo(a), a) for a in arquivos), key=lambda item: item[0]):
+        dados = ler_bytes(arquivo)
+        for aba in abas_de_tarefas(chave, dados):
+            partes.append((chave if aba == 0 else f"{chave}-{aba}", dados, aba))
+    return partes
+
+
+def _arquivos(arquivo):
+    return list(arquivo) if isinstance(arquivo, (list, tuple)) else [arquivo]
+
+
+def planilha_em_memoria(arquivo, colunas=None):
+    """True se as colunas pedidas já estão no cache em memória."""
+    cabecalho, df = registro.obter(chave_arquivo(arquivo))
+    return df is not None and set(resolver_colunas(cabecalho, colunas)) <= set(df.columns)
+
+
+def carregar_planilha(arquivo, colunas=None, andamento=None):
+    """Lê o(s) arquivo(s) enviado(s) e devolve um DataFrame já tipado.
+
+    `arquivo` pode ser uma lista (exportações mensais, por exemplo): as
+    abas com tarefas de todos os arquivos são concatenadas e cada
+    "ID da Tarefa" aparece uma vez. `colunas` lista pelo nome as colunas
+    usadas pela análise (None = todas). O resultado fica em memória pelo
+    hash dos bytes, um por conteúdo para todas as sessões; cada chamada
+    devolve uma visão das colunas pedidas, sem cópia, que não deve ser
+    alterada. `andamento` acompanha a leitura (ver atlantico.segundo_plano).
+    """
+    chave = chave_arquivo(arquivo)
+
+    cabecalho, df = registro.obter(chave)
+    if df is None or not set(resolver_colunas(cabecalho, colunas)) <= set(df.columns):
+        partes = _partes(_arquivos(arquivo))
+        pedidas = colunas
+        if len(partes) > 1 and colunas is not None:
+            pedidas = list(colunas) + [COLUNA_ID] + COLUNAS_RECENCIA  # usadas na deduplicação
+        cabecalho, df = _juntar(_carregar(partes, pedidas, df, andamento))
+        registro.guardar(chave, cabecalho, df)
+
+    # DataFrame montado com as próprias Séries do compartilhado: sem cópia
+    return pd.DataFrame({c: df[c] for c in resolver_colunas(cabecalho, colunas)}, copy=False)
+
+
+def memoria_planilha(arquivo):
+    """(bytes antes, bytes depois) da tipagem do(s) arquivo(s), ou None.
+
+    Vem dos metadados das cópias em disco; None quando alguma não existe.
+    """
+    antes = depois = 0
+    for chave, _, _ in _partes(_arquivos(arquivo)):
+        esquema = sidecar.ler_esquema(chave)
+        uso = sidecar.memoria(esquema) if esquema is not None else None
+        if uso is None:
+            return None
+        antes, depois = antes + uso[0], depois + uso[1]
+    return antes, depois
+
+
+def datas_invalidas_planilha(arquivo):
+    """{coluna: células de data não reconhecidas} do(s) arquivo(s), ou None.
+
+    Vem dos metadados das cópias em disco; None quando alguma não existe.
+    """
+    total = {}
+    for chave, _, _ in _partes(_arquivos(arquivo)):
+        esquema = sidecar.ler_esquema(chave)
+        invalidas = sidecar.datas_invalidas(esquema) if esquema is not None else None
+        if invalidas is None:
+            return None
+        for coluna, n in invalidas.items():
+            total[coluna] = total.get(coluna, 0) + n
+    return total
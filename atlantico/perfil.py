@@ -0,0 +1,193 @@
+"""Instrumentação opcional de cada reexecução do dashboard.
+
+Ligada com a variável de ambiente ATLANTICO_PERFIL=1 ou com `?perfil=1`
+na URL. Cada etapa marcada com `etapa()` (ou `@medir`) registra início e
+duração; ao fim da reexecução a sidebar mostra a cascata de etapas e o
+registro é acrescentado a um arquivo JSON-lines (ATLANTICO_PERFIL_ARQUIVO,
+padrão perfil-atlantico.jsonl) para análise posterior. Desligada,
+`etapa()` não faz nada.
+
+A memória (tracemalloc) só é medida com a variável de ambiente: o
+tracemalloc vale para o processo inteiro e deixa todas as sessões mais
+lentas, então um visitante não pode ligá-lo pela URL. Como o pico também
+é global, uma reexecução por vez mede memória (as simultâneas ficam só
+com os tempos) e o tracemalloc é desligado ao fim dela.
+"""
+
+import contextlib
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+ARQUIVO = os.environ.get("ATLANTICO_PERFIL_ARQUIVO", "perfil-atlantico.jsonl")
+MB = 1024 * 1024
+
+# Registro da reexecução atual (cada reexecução roda na sua própria thread)
+_local = threading.local()
+_lock_arquivo = threading.Lock()
+# Dono do tracemalloc: a única reexecução que mede memória no momento
+_lock_memoria = threading.Lock()
+
+
+def memoria_solicitada():
+    return os.environ.get("ATLANTICO_PERFIL") == "1"
+
+
+def solicitado():
+    if memoria_solicitada():
+        return True
+    try:
+        return st.query_params.get("perfil") == "1"
+    except Exception:
+        return False
+
+
+def iniciar_rerun(ativo=None):
+    if ativo is None:
+        ativo = solicitado()
+    if not ativo:
+        _local.rerun = None
+        return
+    memoria = memoria_solicitada() and _lock_memoria.acquire(blocking=False)
+    if memoria:
+        tracemalloc.start()
+    _local.rerun = {
+        "quando": datetime.datetime.now().isoformat(timespec="milliseconds"),
+        "inicio": time.perf_counter(),
+        "memoria": memoria,
+        "memoria_inicial": tracemalloc.get_traced_memory()[0] if memoria else 0,
+        "etapas": [],
+        "pilha": [],
+    }
+
+
+def ativo():
+    return getattr(_local, "rerun", None) is not None
+
+
+@contextlib.contextmanager
+def etapa(nome):
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        yield
+        return
+
+    if not rerun["memoria"]:
+        rerun["pilha"].append({})
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fim = time.perf_counter()
+            rerun["pilha"].pop()
+            _registrar(rerun, nome, inicio, fim)
+        return
+
+    pilha = rerun["pilha"]
+    atual, pico = tracemalloc.get_traced_memory()
+    if pilha:
+        pilha[-1]["pico"] = max(pilha[-1]["pico"], pico)
+    tracemalloc.reset_peak()
+    quadro = {"pico": atual}
+    pilha.append(quadro)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        fim = time.perf_counter()
+        depois, pico = tracemalloc.get_traced_memory()
+        pilha.pop()
+        pico = max(quadro["pico"], pico)
+        if pilha:
+            pilha[-1]["pico"] = max(pilha[-1]["pico"], pico)
+        tracemalloc.reset_peak()
+        _registrar(rerun, nome, inicio, fim, (depois - atual) / MB, (pico - atual) / MB)
+
+
+def _registrar(rerun, nome, inicio, fim, memoria_mb=None, pico_mb=None):
+    rerun["etapas"].append({
+        "etapa": nome,
+        "nivel": len(rerun["pilha"]),
+        "inicio_ms": (inicio - rerun["inicio"]) * 1000,
+        "duracao_ms": (fim - inicio) * 1000,
+        "memoria_mb": memoria_mb,
+        "pico_mb": pico_mb,
+    })
+
+
+def medir(nome):
+    """Decorador: mede cada chamada da função como uma etapa."""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with etapa(nome):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+
+def finalizar_rerun():
+    """Encerra o registro, grava no JSON-lines e devolve o registro (ou None)."""
+    rerun = getattr(_local, "rerun", None)
+    _local.rerun = None
+    if rerun is None:
+        return None
+
+    memoria_mb = None
+    if rerun["memoria"]:
+        memoria_mb = (tracemalloc.get_traced_memory()[0] - rerun["memoria_inicial"]) / MB
+        # Nenhuma outra reexecução mede memória: o tracemalloc para aqui
+        tracemalloc.stop()
+        _lock_memoria.release()
+    registro = {
+        "quando": rerun["quando"],
+        "total_ms": (time.perf_counter() - rerun["inicio"]) * 1000,
+        "memoria_mb": memoria_mb,
+        "etapas": sorted(rerun["etapas"], key=lambda e: e["inicio_ms"]),
+    }
+    try:
+        with _lock_arquivo, open(ARQUIVO, "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+    return registro
+
+
+def exibir_painel(registro):
+    """Cascata das etapas da reexecução na sidebar."""
+    if not registro:
+        return
+    with st.sidebar.expander(f"⏱ Perfil: {registro['total_ms']:.0f} ms", expanded=False):
+        etapas = pd.DataFrame(registro["etapas"])
+        if etapas.empty:
+            st.caption("Nenhuma etapa medida.")
+            return
+        rotulos = ["· " * n + e for n, e in zip(etapas["nivel"], etapas["etapa"])]
+        fig = go.Figure(go.Bar(
+            y=rotulos, x=etapas["duracao_ms"], base=etapas["inicio_ms"],
+            orientation="h", hovertext=[f"{d:.1f} ms" for d in etapas["duracao_ms"]],
+        ))
+        fig.update_layout(
+            height=max(200, 22 * len(etapas)), margin=dict(l=10, r=10, t=10, b=10),
+            yaxis=dict(autorange="reversed"), xaxis_title="ms",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        colunas = ["etapa", "duracao_ms"]
+        if registro["memoria_mb"] is not None:
+            colunas += ["memoria_mb", "pico_mb"]
+        st.dataframe(
+            etapas.assign(etapa=rotulos)[colunas].round(2),
+            hide_index=True, use_container_width=True,
+        )
+        if registro["memoria_mb"] is None:
+            st.caption(f"Memória não medida nesta reexecução · gravado em {ARQUIVO}")
+        else:
+            st.caption(f"Memória retida na reexecução: {registro['memoria_mb']:.1f} MB · gravado em {ARQUIVO}")
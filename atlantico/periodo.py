@@ -0,0 +1,88 @@
+"""Filtro global de período, na barra lateral.
+
+A janela escolhida vale para os cards e para todas as análises. O corte
+usa o IndiceDatas (busca binária sobre as datas ordenadas), montado uma
+vez por arquivo e coluna de referência.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from atlantico.indice import indice_datas
+
+COLUNAS = ["Criada em", "Fechada em"]
+
+TODO = "Todo o histórico"
+ULTIMOS = {"Últimos 30 dias": 30, "Últimos 90 dias": 90}
+TRIMESTRE = "Trimestre"
+PERSONALIZADO = "Personalizado"
+OPCOES = [TODO, *ULTIMOS, TRIMESTRE, PERSONALIZADO]
+
+UM_DIA = pd.Timedelta(days=1)
+
+
+def trimestres(menor, maior):
+    """Trimestres entre as datas, do mais recente ao mais antigo."""
+    return list(pd.period_range(menor, maior, freq="Q"))[::-1]
+
+
+def rotulo_trimestre(periodo):
+    return f"{periodo.year} T{periodo.quarter}"
+
+
+def _intervalo(opcao, menor, maior):
+    """(inicio, fim) da janela escolhida; `fim` é exclusivo."""
+    if opcao in ULTIMOS:
+        # Contado a partir da data mais recente da exportação
+        fim = maior.normalize() + UM_DIA
+        return fim - ULTIMOS[opcao] * UM_DIA, fim
+    if opcao == TRIMESTRE:
+        periodo = st.sidebar.selectbox("Trimestre", trimestres(menor, maior), format_func=rotulo_trimestre)
+        return periodo.start_time, (periodo + 1).start_time
+    datas = st.sidebar.date_input(
+        "Intervalo", (menor.date(), maior.date()),
+        min_value=menor.date(), max_value=maior.date(), format="DD/MM/YYYY",
+    )
+    if not isinstance(datas, (list, tuple)):
+        datas = (datas,)
+    if not datas:
+        # Intervalo apagado durante a edição: vale o histórico todo
+        datas = (menor.date(), maior.date())
+    # Enquanto só a primeira data foi escolhida, vale um único dia
+    inicio = pd.Timestamp(datas[0])
+    fim = pd.Timestamp(datas[-1]) if len(datas) > 1 else inicio
+    return inicio, fim + UM_DIA
+
+
+def filtrar_periodo(df, chave):
+    """Mostra os controles de período e devolve (df da janela, chave da janela).
+
+    A chave da janela separa o cache das análises de cada período. Sem
+    filtro, o DataFrame e a chave voltam como vieram.
+    """
+    colunas = [c for c in COLUNAS if c in df.columns]
+    if not colunas:
+        return df, chave
+
+    st.sidebar.header("🗓️ Período")
+    opcao = st.sidebar.selectbox(
+        "Janela", OPCOES,
+        help="Os últimos dias são contados a partir da data mais recente do arquivo.",
+    )
+    if opcao == TODO:
+        return df, chave
+    coluna = st.sidebar.radio("Data de referência", colunas, horizontal=True)
+
+    indice = indice_datas(chave, df, coluna)
+    menor, maior = indice.limites()
+    if menor is None:
+        st.sidebar.caption(f"Nenhuma tarefa com '{coluna}' preenchida.")
+        return df.iloc[:0].copy(deep=False), f"{chave}@{coluna}:vazio"
+
+    inicio, fim = _intervalo(opcao, menor, maior)
+    lo, hi = indice.intervalo(inicio, fim)
+    st.sidebar.caption(f"{hi - lo:,} de {len(df):,} tarefas no período".replace(",", "."))
+
+    # Só as linhas da janela são copiadas, em ordem de data
+    janela = df.take(indice.ordem[lo:hi]).reset_index(drop=True)
+    return janela, f"{chave}@{coluna}:{inicio:%Y-%m-%d}:{fim:%Y-%m-%d}"
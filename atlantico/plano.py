@@ -0,0 +1,145 @@
+"""Planos preguiçosos para a preparação dos dados das análises.
+
+Cada análise descreve o que precisa (fonte → filtros → colunas derivadas
+→ explode) e o plano decide como executar:
+
+* colunas derivadas que não dependem do explode são calculadas sobre a
+  fonte, uma vez por arquivo, e compartilhadas entre as análises (ex.: o
+  `tempo_dias` e as horas convertidas);
+* filtros que não dependem do explode são aplicados antes dele, e filtros
+  consecutivos viram uma única máscara, com um único `take` no fim;
+* o DataFrame recebido nunca é alterado, então as cópias defensivas
+  (`.copy()`) deixam de ser necessárias.
+
+Filtros e colunas derivadas devem ser operações linha a linha; filtros
+devolvem uma máscara booleana sem nulos.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from atlantico.perfil import etapa
+from atlantico.resultados import memorizar
+from atlantico.transformacoes import explodir_multivalorado
+
+# `calcular(colunas)` devolve a Série; `usa` lista as colunas lidas. Para
+# o compartilhamento entre análises, `calcular` deve ser uma função de
+# módulo (lambdas novas a cada execução nunca reaproveitariam o cache).
+Coluna = namedtuple("Coluna", ["nome", "usa", "calcular"])
+Filtro = namedtuple("Filtro", ["usa", "condicao"])
+Explode = namedtuple("Explode", ["coluna", "destino"])
+
+
+class Plano:
+    """Sequência imutável de passos; nada é calculado até `executar`."""
+
+    def __init__(self, passos=()):
+        self.passos = tuple(passos)
+
+    def derivar(self, coluna):
+        return Plano(self.passos + (coluna,))
+
+    def filtrar(self, usa, condicao):
+        return Plano(self.passos + (Filtro(tuple(usa), condicao),))
+
+    def explodir(self, coluna, destino):
+        return Plano(self.passos + (Explode(coluna, destino),))
+
+    def otimizar(self):
+        """Separa os passos em (antes do explode, explode, depois do explode).
+
+        Um passo vai para antes do explode se não lê o destino do explode
+        nem colunas derivadas que ficaram depois dele.
+        """
+        antes, explode, depois = [], None, []
+        dependentes = set()
+        for passo in self.passos:
+            if isinstance(passo, Explode):
+                if explode is not None:
+                    raise ValueError("O plano aceita um único explode.")
+                explode = passo
+                dependentes.add(passo.destino)
+                continue
+            if explode is not None and dependentes & set(passo.usa):
+                depois.append(passo)
+                if isinstance(passo, Coluna):
+                    dependentes.add(passo.nome)
+            else:
+                antes.append(passo)
+        return antes, explode, depois
+
+    def executar(self, df, chave=None):
+        """Roda o plano sobre `df` (que não é alterado).
+
+        Com `chave` (a do arquivo), as colunas derivadas da fonte ficam no
+        cache de resultados e são reaproveitadas por outros planos.
+        """
+        antes, explode, depois = self.otimizar()
+        with etapa("plano"):
+            resultado = _aplicar(df, antes, chave)
+            if explode is not None:
+                resultado = explodir_multivalorado(resultado, explode.coluna, explode.destino)
+                resultado = _aplicar(resultado, depois, None, proprio=True)
+        return resultado
+
+
+def _calcular(coluna, colunas, chave):
+    if chave is None:
+        return coluna.calcular(colunas)
+    return memorizar(chave, f"coluna.{coluna.nome}", (coluna.calcular,), lambda: coluna.calcular(colunas))
+
+
+def _aplicar(df, passos, chave, proprio=False):
+    """Colunas derivadas e filtros (fundidos numa máscara) com um único take.
+
+    `proprio=True` indica que `df` foi criado pelo plano e pode receber as
+    colunas diretamente.
+    """
+    if not passos:
+        return df if proprio else df.copy(deep=False)
+
+    # Visão das colunas: originais + derivadas, sem montar DataFrames intermediários
+    colunas = {nome: df[nome] for nome in df.columns}
+    derivadas = {}
+    mascara = None
+    for passo in passos:
+        if isinstance(passo, Coluna):
+            colunas[passo.nome] = derivadas[passo.nome] = _calcular(passo, colunas, chave)
+        else:
+            condicao = np.asarray(passo.condicao(colunas), dtype=bool)
+            mascara = condicao if mascara is None else mascara & condicao
+
+    if mascara is None:
+        resultado = df if proprio else df.copy(deep=False)
+        for nome, serie in derivadas.items():
+            resultado[nome] = serie
+        return resultado
+
+    posicoes = np.flatnonzero(mascara)
+    resultado = df.take(posicoes)
+    for nome, serie in derivadas.items():
+        resultado[nome] = serie.iloc[posicoes].set_axis(resultado.index)
+    return resultado
+
+
+# ===================================================================
+# =====================  E X P R E S S Õ E S   C O M U N S  ==========
+# ===================================================================
+def _horas(colunas):
+    return pd.to_numeric(colunas["Já registradas h"], errors="coerce")
+
+
+def _percentual(colunas):
+    return pd.to_numeric(colunas["%"], errors="coerce")
+
+
+def _tempo_horas(colunas):
+    # Positivo = fechada antes da entrega desejada (em horas)
+    return (colunas["Fechada em"] - colunas["Entrega desejada"]) / pd.Timedelta(days=1) * 24 * -1
+
+
+HORAS = Coluna("Já registradas h", ("Já registradas h",), _horas)
+PERCENTUAL = Coluna("%", ("%",), _percentual)
+TEMPO_DIAS = Coluna("tempo_dias", ("Fechada em", "Entrega desejada"), _tempo_horas)
@@ -0,0 +1,118 @@
+"""Prévia por amostra para a primeira pintura com exportações enormes.
+
+Com milhões de linhas, preparar os dados de uma análise (explode das
+equipes, conversões) leva segundos, mas quase sempre o usuário só quer
+bater o olho nos gráficos de barras antes de detalhar. Com a prévia
+ligada (opção na sidebar), a análise mostra primeiro os agregados
+estimados numa amostra aleatória simples das tarefas, com intervalo de
+confiança de 95%, e calcula o resultado exato em segundo plano; quando
+ele fica pronto, a página é reexecutada e o troca pela prévia.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from atlantico import segundo_plano
+from atlantico.resultados import disponivel, memorizar
+
+# Abaixo disso o cálculo exato já é rápido e a prévia não aparece
+LIMITE_LINHAS = 200_000
+TAMANHO_AMOSTRA = 20_000
+# Quantil da normal para o intervalo de 95%
+Z = 1.96
+# Intervalo (s) entre as verificações do resultado exato
+INTERVALO = 0.5
+
+
+def ativa(df):
+    return bool(st.session_state.get("previa")) and len(df) > LIMITE_LINHAS
+
+
+def amostra(df, chave, tamanho=TAMANHO_AMOSTRA, semente=0):
+    """Amostra aleatória simples das linhas (sem reposição), uma vez por arquivo."""
+    def sortear():
+        posicoes = np.random.default_rng(semente).choice(len(df), size=min(tamanho, len(df)), replace=False)
+        return df.take(np.sort(posicoes))
+    return memorizar(chave, "previa.amostra", (tamanho, semente), sortear)
+
+
+def media_com_intervalo(valores, grupos):
+    """Média de `valores` por grupo, com a meia largura do IC 95% em "erro"."""
+    valores = valores.astype("float64")
+    estatisticas = valores.groupby(grupos, observed=True).agg(["mean", "std", "count"])
+    erro = Z * estatisticas["std"].fillna(0) / np.sqrt(estatisticas["count"])
+    return pd.DataFrame({
+        "media": estatisticas["mean"].round(2), "erro": erro.round(2), "n": estatisticas["count"],
+    }).reset_index()
+
+
+def total_com_intervalo(valores, grupos, total_linhas):
+    """Total estimado por grupo para `total_linhas` linhas, com o IC 95% em "erro".
+
+    Estimador de domínio da amostra aleatória simples: para cada grupo,
+    y = valor nas linhas do grupo e 0 nas demais; total = N · média(y).
+    """
+    valores = valores.astype("float64")
+    n = len(valores)
+    fracao = n / total_linhas
+    soma = valores.groupby(grupos, observed=True).sum()
+    soma_quadrados = (valores ** 2).groupby(grupos, observed=True).sum()
+    media = soma / n
+    variancia = ((soma_quadrados - n * media ** 2) / max(n - 1, 1)).clip(lower=0)
+    erro = Z * total_linhas * np.sqrt((1 - fracao) * variancia / n)
+    return pd.DataFrame({
+        "total": (total_linhas * media).round(2), "erro": erro.round(2),
+        "n": valores.groupby(grupos, observed=True).count(),
+    }).reset_index()
+
+
+def grafico_intervalo(estimativa, x, y, rotulo):
+    """Barras com o intervalo de confiança como barra de erro."""
+    fig = px.bar(
+        estimativa.sort_values(y, ascending=False), x=x, y=y, error_y="erro",
+        labels={y: rotulo}, height=450,
+    )
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+def aviso(df, tamanho=TAMANHO_AMOSTRA):
+    st.info(
+        f"⚡ Prévia: amostra de {min(tamanho, len(df)):,} de {len(df):,} tarefas "
+        "(barras de erro = IC 95%). O resultado exato aparece assim que ficar pronto."
+        .replace(",", ".")
+    )
+
+
+def exato(chave, nome, calcular):
+    """True se o resultado exato de `nome` está pronto.
+
+    Senão, `calcular()` (que deve deixar os resultados no cache) roda em
+    segundo plano e a página é reexecutada quando ele terminar. Se ele
+    falhar, o erro é relançado na reexecução seguinte.
+    """
+    if disponivel(chave, f"previa.{nome}"):
+        return True
+    def pronto():
+        calcular()
+        # Só a marca vai para o cache: o retorno de `calcular()` pode passar
+        # do orçamento do LRU, que então o descartaria sem avisar
+        return True
+
+    trabalho = segundo_plano.iniciar(
+        ("previa", chave, nome), lambda _: memorizar(chave, f"previa.{nome}", (), pronto)
+    )
+    if trabalho.futuro.done():
+        trabalho.futuro.result()  # relança erros do cálculo
+        return True
+
+    @st.fragment(run_every=INTERVALO)
+    def acompanhar():
+        if trabalho.futuro.done():
+            st.rerun()
+        st.caption("⏳ Calculando o resultado exato…")
+
+    acompanhar()
+    return False
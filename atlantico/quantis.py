@@ -0,0 +1,206 @@
+"""Quantis e médias aparadas por grupo: exatos ou por esboços mescláveis (t-digest).
+
+Com os dados em memória, `resumo_exato` usa o groupby do pandas. Quando
+as linhas chegam em blocos (leitura com memória limitada), o esboço
+guarda a distribuição em ~COMPRESSAO/2 centróides (média, peso): finos
+nas caudas, onde estão p90/p99, e grossos no meio. Esboços de blocos,
+abas ou arquivos diferentes se mesclam sem voltar aos dados.
+"""
+
+import numpy as np
+import pandas as pd
+
+COMPRESSAO = 500
+# Linhas ordenadas por vez em `por_grupo`
+TAMANHO_BLOCO = 1_000_000
+
+
+def _escala(q, compressao):
+    # Função de escala k1 do t-digest: centróides menores perto de q = 0 e 1
+    return compressao / (2 * np.pi) * np.arcsin(2 * np.clip(q, 0, 1) - 1)
+
+
+def _limite(q, compressao):
+    # Maior quantil que um centróide iniciado em q pode alcançar (k(q) + 1)
+    k = min(_escala(q, compressao) + 1, compressao / 4)
+    return (np.sin(2 * np.pi * k / compressao) + 1) / 2
+
+
+class Esboco:
+    """t-digest ("merging digest"): centróides ordenados pela média."""
+
+    def __init__(self, medias, pesos, minimo, maximo, compressao=COMPRESSAO):
+        self.medias = medias
+        self.pesos = pesos
+        self.minimo = minimo
+        self.maximo = maximo
+        self.compressao = compressao
+
+    @classmethod
+    def construir(cls, valores, compressao=COMPRESSAO, ordenados=False):
+        valores = np.asarray(valores, dtype="float64")
+        valores = valores[~np.isnan(valores)]
+        if not ordenados:
+            valores = np.sort(valores)
+        if not len(valores):
+            return cls(valores, valores, np.nan, np.nan, compressao)
+        return cls(valores, np.ones(len(valores)), valores[0], valores[-1], compressao)._comprimido()
+
+    @property
+    def n(self):
+        return float(self.pesos.sum())
+
+    def _comprimido(self):
+        total = self.pesos.sum()
+        # Até COMPRESSAO pontos o esboço guarda os próprios valores (exato)
+        if total == 0 or len(self.pesos) <= self.compressao:
+            return self
+        if (self.pesos == 1).all():
+            return self._comprimido_unitario(total)
+        return self._comprimido_sequencial(total)
+
+    def _comprimido_unitario(self, total):
+        # Valores soltos (peso 1): vizinhos com o mesmo valor inteiro da
+        # escala viram um centróide, que cobre no máximo ~1 unidade dela
+        centros = (np.arange(len(self.pesos)) + 0.5) / total
+        grupos = np.floor(_escala(centros, self.compressao)).astype("int64")
+        grupos -= grupos[0]
+        pesos = np.bincount(grupos)
+        somas = np.bincount(grupos, weights=self.medias)
+        usados = pesos > 0
+        return Esboco(somas[usados] / pesos[usados], pesos[usados].astype("float64"),
+                      self.minimo, self.maximo, self.compressao)
+
+    def _comprimido_sequencial(self, total):
+        # Mescla de esboços: centróides já pesados só absorvem o vizinho se
+        # o resultado couber numa unidade da escala (algoritmo do t-digest)
+        medias, pesos = [], []
+        media, peso = float(self.medias[0]), float(self.pesos[0])
+        acumulado = 0.0
+        limite = _limite(acumulado / total, self.compressao)
+        for proxima, peso_proximo in zip(self.medias[1:].tolist(), self.pesos[1:].tolist()):
+            if (acumulado + peso + peso_proximo) / total <= limite:
+                media += (proxima - media) * peso_proximo / (peso + peso_proximo)
+                peso += peso_proximo
+                continue
+            medias.append(media)
+            pesos.append(peso)
+            acumulado += peso
+            limite = _limite(acumulado / total, self.compressao)
+            media, peso = proxima, peso_proximo
+        medias.append(media)
+        pesos.append(peso)
+        return Esboco(np.array(medias), np.array(pesos), self.minimo, self.maximo, self.compressao)
+
+    def mesclar(self, outro):
+        """Esboço da união dos dados dos dois esboços."""
+        if not outro.n:
+            return self
+        if not self.n:
+            return outro
+        medias = np.concatenate([self.medias, outro.medias])
+        pesos = np.concatenate([self.pesos, outro.pesos])
+        ordem = np.argsort(medias, kind="stable")
+        return Esboco(
+            medias[ordem], pesos[ordem],
+            min(self.minimo, outro.minimo), max(self.maximo, outro.maximo), self.compressao,
+        )._comprimido()
+
+    def quantil(self, q):
+        """Quantil `q` (0 a 1), interpolado entre os centróides."""
+        total = self.n
+        if not total:
+            return np.nan
+        if len(self.medias) == total:
+            # Grupo pequeno, sem compressão: quantil exato (como o pandas)
+            return float(np.quantile(self.medias, q))
+        centros = np.cumsum(self.pesos) - self.pesos / 2
+        posicoes = np.concatenate([[0.0], centros, [total]])
+        valores = np.concatenate([[self.minimo], self.medias, [self.maximo]])
+        return float(np.interp(q * total, posicoes, valores))
+
+    def media_aparada(self, corte=0.1):
+        """Média sem os `corte` (fração) menores e maiores valores."""
+        total = self.n
+        if not total:
+            return np.nan
+        fim = np.cumsum(self.pesos)
+        inicio = fim - self.pesos
+        dentro = np.clip(np.minimum(fim, (1 - corte) * total) - np.maximum(inicio, corte * total), 0, None)
+        if not dentro.sum():
+            return self.quantil(0.5)
+        return float((dentro * self.medias).sum() / dentro.sum())
+
+
+def por_grupo(valores, grupos, tamanho_bloco=TAMANHO_BLOCO):
+    """{grupo: Esboco} numa passada, ordenando um bloco de linhas por vez."""
+    valores = pd.Series(valores).astype("float64").to_numpy()
+    codigos, rotulos = pd.factorize(pd.Series(grupos), sort=True)
+    esbocos = {}
+    for inicio in range(0, len(valores), tamanho_bloco):
+        bloco_valores = valores[inicio:inicio + tamanho_bloco]
+        bloco_codigos = codigos[inicio:inicio + tamanho_bloco]
+        validos = (bloco_codigos >= 0) & ~np.isnan(bloco_valores)
+        bloco_valores, bloco_codigos = bloco_valores[validos], bloco_codigos[validos]
+        # Uma ordenação por bloco: por grupo e, dentro dele, por valor
+        ordem = np.lexsort((bloco_valores, bloco_codigos))
+        bloco_valores, bloco_codigos = bloco_valores[ordem], bloco_codigos[ordem]
+        cortes = np.flatnonzero(np.diff(bloco_codigos)) + 1
+        for trecho_valores, trecho_codigos in zip(np.split(bloco_valores, cortes), np.split(bloco_codigos, cortes)):
+            if not len(trecho_codigos):
+                continue
+            rotulo = rotulos[trecho_codigos[0]]
+            esboco = Esboco.construir(trecho_valores, ordenados=True)
+            esbocos[rotulo] = esbocos[rotulo].mesclar(esboco) if rotulo in esbocos else esboco
+    return esbocos
+
+
+def mesclar_grupos(*partes):
+    """Junta vários {grupo: Esboco} (ex.: de arquivos diferentes)."""
+    esbocos = {}
+    for parte in partes:
+        for rotulo, esboco in parte.items():
+            esbocos[rotulo] = esbocos[rotulo].mesclar(esboco) if rotulo in esbocos else esboco
+    return esbocos
+
+
+def resumo_exato(valores, grupos, coluna, quantis=(0.5, 0.9, 0.99), corte=0.1):
+    """Como `resumo`, calculado direto dos valores (sem esboço).
+
+    A média aparada é a média dos valores entre os quantis `corte` e
+    1 − `corte` do grupo, saídos do mesmo `quantile` dos demais.
+    """
+    valores = pd.Series(valores).astype("float64").to_numpy()
+    codigos, rotulos = pd.factorize(pd.Series(grupos), sort=True)
+    validos = (codigos >= 0) & ~np.isnan(valores)
+    valores, codigos = valores[validos], codigos[validos]
+    nomes = [f"p{round(q * 100)}" for q in quantis]
+    colunas = [coluna, "n", *nomes, "media_aparada"]
+    if not len(valores):
+        return pd.DataFrame(columns=colunas)
+
+    # Códigos inteiros: o groupby não precisa comparar os rótulos
+    agrupados = pd.Series(valores).groupby(codigos)
+    cortes = agrupados.quantile(sorted({*quantis, corte, 1 - corte})).unstack()
+    baixo, alto = cortes[corte].to_numpy()[codigos], cortes[1 - corte].to_numpy()[codigos]
+    dentro = (valores >= baixo) & (valores <= alto)
+    tabela = cortes[list(quantis)].set_axis(nomes, axis=1)
+    tabela.insert(0, "n", agrupados.size())
+    tabela["media_aparada"] = pd.Series(valores[dentro]).groupby(codigos[dentro]).mean()
+    tabela.insert(0, coluna, np.asarray(rotulos, dtype=object)[tabela.index])
+    return tabela.reset_index(drop=True)[colunas]
+
+
+def resumo(esbocos, coluna, quantis=(0.5, 0.9, 0.99), corte=0.1):
+    """DataFrame com n, os quantis e a média aparada de cada grupo."""
+    linhas = [
+        {
+            coluna: rotulo,
+            "n": int(esboco.n),
+            **{f"p{round(q * 100)}": esboco.quantil(q) for q in quantis},
+            "media_aparada": esboco.media_aparada(corte),
+        }
+        for rotulo, esboco in esbocos.items()
+    ]
+    colunas = [coluna, "n", *(f"p{round(q * 100)}" for q in quantis), "media_aparada"]
+    return pd.DataFrame(linhas, columns=colunas)
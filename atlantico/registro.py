@@ -0,0 +1,130 @@
+"""Conjuntos de dados compartilhados entre as sessões, com contagem de referências.
+
+Vários líderes costumam abrir a mesma exportação semanal ao mesmo tempo.
+O DataFrame de cada conteúdo (hash dos bytes) existe uma única vez no
+processo: todas as sessões que usam aquele conteúdo recebem visões
+somente leitura dele, e os índices e resultados derivados (também
+guardados pela chave) são compartilhados do mesmo jeito.
+
+Cada sessão segura uma referência ao conjunto que está usando. Quando a
+última sessão solta a referência (trocou de arquivo ou foi encerrada), o
+conjunto e tudo o que foi derivado dele saem da memória, em vez de
+esperar o LRU. Conjuntos lidos fora de uma sessão (benchmarks, linha de
+comando) ficam num LRU próprio, como antes.
+"""
+
+import threading
+import uuid
+import weakref
+
+from atlantico import indice, resultados
+from atlantico.cache import CacheLRU, tamanho_em_bytes
+
+# Nome da referência guardada no session_state de cada sessão
+CHAVE_SESSAO = "referencia_dados"
+
+_trava = threading.RLock()
+# chave -> Conjunto em uso por alguma sessão
+_conjuntos = {}
+# id da sessão -> chave do conjunto que ela usa
+_sessoes = {}
+# Conjuntos sem sessão: chave -> (cabeçalho, df, bytes)
+_avulsos = CacheLRU(max_entradas=8, max_bytes=512 * 1024 * 1024)
+
+
+class Conjunto:
+    """DataFrame tipado de um conteúdo e as sessões que o usam.
+
+    `nbytes` é medido uma vez, em `guardar` (fora da trava), e não a cada
+    consulta das estatísticas.
+    """
+
+    def __init__(self, cabecalho=None, df=None, nbytes=0):
+        self.cabecalho = cabecalho
+        self.df = df
+        self.nbytes = nbytes
+        self.sessoes = set()
+
+
+class Referencia:
+    """Referência de uma sessão; some junto com o session_state da sessão."""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        weakref.finalize(self, soltar, self.id)
+
+    @property
+    def chave(self):
+        return _sessoes.get(self.id)
+
+
+def obter(chave):
+    """(cabeçalho, df) do conteúdo, ou (None, None) se não está em memória."""
+    with _trava:
+        conjunto = _conjuntos.get(chave)
+        if conjunto is not None:
+            return conjunto.cabecalho, conjunto.df
+    cabecalho, df, _ = _avulsos.get(chave, (None, None, 0))
+    return cabecalho, df
+
+
+def guardar(chave, cabecalho, df):
+    """Guarda o DataFrame do conteúdo (compartilhado; não deve ser alterado)."""
+    nbytes = tamanho_em_bytes(df)
+    with _trava:
+        conjunto = _conjuntos.get(chave)
+        if conjunto is not None:
+            conjunto.cabecalho, conjunto.df, conjunto.nbytes = cabecalho, df, nbytes
+            return
+    _avulsos.set(chave, (cabecalho, df, nbytes), tamanho=nbytes)
+
+
+def vincular(estado, chave):
+    """Faz a sessão dona de `estado` (o session_state) usar o conjunto `chave`.
+
+    A referência ao conjunto anterior da sessão, se havia, é solta.
+    """
+    referencia = estado.get(CHAVE_SESSAO)
+    if referencia is None:
+        referencia = estado[CHAVE_SESSAO] = Referencia()
+    with _trava:
+        if _sessoes.get(referencia.id) == chave:
+            return
+        soltar(referencia.id)
+        conjunto = _conjuntos.get(chave)
+        if conjunto is None:
+            # Lido antes de alguma sessão usá-lo: passa a ser compartilhado
+            cabecalho, df, nbytes = _avulsos.get(chave, (None, None, 0))
+            _avulsos.descartar(lambda item: item == chave)
+            conjunto = _conjuntos[chave] = Conjunto(cabecalho, df, nbytes)
+        conjunto.sessoes.add(referencia.id)
+        _sessoes[referencia.id] = chave
+
+
+def soltar(id_sessao):
+    """Solta a referência da sessão; o último a soltar descarta o conjunto."""
+    with _trava:
+        chave = _sessoes.pop(id_sessao, None)
+        conjunto = _conjuntos.get(chave)
+        if conjunto is None:
+            return
+        conjunto.sessoes.discard(id_sessao)
+        if conjunto.sessoes:
+            return
+        del _conjuntos[chave]
+    resultados.descartar(chave)
+    indice.descartar(chave)
+
+
+def estatisticas():
+    """Conjuntos em uso, bytes ocupados e sessões por conjunto."""
+    with _trava:
+        conjuntos = {chave: (len(c.sessoes), c.nbytes) for chave, c in _conjuntos.items()}
+    avulsos = _avulsos.estatisticas()
+    return {
+        "conjuntos": len(conjuntos),
+        "bytes": sum(nbytes for _, nbytes in conjuntos.values()),
+        "sessoes": {chave: sessoes for chave, (sessoes, _) in conjuntos.items()},
+        "avulsos": avulsos["entradas"],
+        "bytes_avulsos": avulsos["bytes"],
+    }
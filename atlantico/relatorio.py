@@ -0,0 +1,210 @@
+"""Relatório em lote das análises, sem o Streamlit (linha de comando).
+
+    python -m atlantico.relatorio exportacoes/ --saida relatorios/
+
+Cada exportação (.xlsx) do diretório é processada num processo separado,
+com os mesmos agregados dos dashboards. Para cada arquivo sai uma pasta
+com um CSV por agregado e um index.html com as tabelas e os gráficos;
+o Plotly é gravado uma vez (plotly.min.js) e o HTML abre sem rede.
+
+Com --baixa-memoria a planilha não é carregada inteira: ela é lida em
+blocos de linhas e só saem os totais, somas e médias por equipe, pessoa
+e tipo de tarefa e a distribuição do atraso por equipe (quantis por
+esboços mesclados), com memória limitada qualquer que seja o arquivo.
+"""
+
+import argparse
+import html
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from atlantico import analises
+from atlantico.agregacao import AgregadorIncremental, agregar_planilha
+from atlantico.analises import Secao
+from atlantico.analises.tempo import DistribuicaoEmBlocos, grafico_distribuicao
+from atlantico.cubos import GRANULARIDADES
+from atlantico.incremental import AGREGADOS
+from atlantico.ingestao import carregar_planilha
+
+# Mesmas colunas extras que o dashboard lê (cards e filtro de período)
+COLUNAS_BASE = ["Criada em", "Fechada em"]
+EXTENSOES = (".xlsx", ".xls")
+# O HTML mostra só o começo das tabelas grandes; o CSV tem todas as linhas
+LINHAS_HTML = 500
+
+PAGINA = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{titulo}</title>
+<script src="{plotly}"></script>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; font-size: 0.85em; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 6px; }}
+</style>
+</head>
+<body>
+<h1>{titulo}</h1>
+{corpo}
+</body>
+</html>
+"""
+
+
+def exportacoes(diretorio):
+    return sorted(
+        os.path.join(diretorio, nome) for nome in os.listdir(diretorio)
+        if nome.lower().endswith(EXTENSOES) and not nome.startswith("~$")
+    )
+
+
+def _tabela_html(tabela):
+    trecho = tabela.head(LINHAS_HTML).to_html(index=False, na_rep="", border=0)
+    if len(tabela) > LINHAS_HTML:
+        trecho += f"<p><em>Primeiras {LINHAS_HTML} de {len(tabela)} linhas (todas no CSV).</em></p>"
+    return trecho
+
+
+def _secoes_html(nome, secoes, destino):
+    partes = []
+    for secao in secoes:
+        secao.tabela.to_csv(os.path.join(destino, f"{nome}.{secao.nome}.csv"), index=False)
+        partes.append(f"<h3>{html.escape(secao.titulo)}</h3>")
+        if secao.figura is not None:
+            partes.append(secao.figura.to_html(full_html=False, include_plotlyjs=False))
+        partes.append(_tabela_html(secao.tabela))
+    return partes
+
+
+def secoes_em_blocos(dados):
+    """Seções por equipe, pessoa e tipo e a distribuição do atraso, lendo a planilha bloco a bloco."""
+    agregadores = [AgregadorIncremental(**parametros) for _, parametros in AGREGADOS.values()]
+    resultados, linhas = agregar_planilha(dados, agregadores + [DistribuicaoEmBlocos()])
+    *resultados, distribuicao = resultados
+    secoes = [
+        Secao(nome, rotulo, resultado.sort_values("total", ascending=False).round(2).reset_index(), None)
+        for (nome, (rotulo, _)), resultado in zip(AGREGADOS.items(), resultados)
+    ]
+    if not distribuicao.empty:
+        secoes.append(Secao(
+            "distribuicao", "Distribuição do atraso por equipe (p50/p90/p99, média aparada 10%; estimada)",
+            distribuicao, grafico_distribuicao(distribuicao),
+        ))
+    return secoes, linhas
+
+
+def processar(caminho, saida, nomes, frequencia, baixa_memoria=False):
+    """Gera o relatório de uma exportação; devolve (linhas, segundos)."""
+    inicio = time.perf_counter()
+    with open(caminho, "rb") as arquivo:
+        dados = arquivo.read()
+
+    base = os.path.splitext(os.path.basename(caminho))[0]
+    destino = os.path.join(saida, base)
+
+    if baixa_memoria:
+        secoes, linhas = secoes_em_blocos(dados)
+        os.makedirs(destino, exist_ok=True)
+        corpo = [f"<p>{linhas} tarefas (agregados lidos em blocos).</p>"]
+        corpo += _secoes_html("resumo", secoes, destino)
+        _gravar_pagina(destino, base, corpo)
+        return linhas, time.perf_counter() - inicio
+
+    df = carregar_planilha(dados, colunas=COLUNAS_BASE + analises.colunas(nomes))
+    os.makedirs(destino, exist_ok=True)
+    corpo = [f"<p>{len(df)} tarefas.</p>"]
+    for nome in nomes:
+        corpo.append(f"<h2>{html.escape(analises.ANALISES[nome].rotulo)}</h2>")
+        try:
+            secoes = analises.carregar(nome).relatorio(df, frequencia)
+        except KeyError as erro:
+            # Exportação sem alguma coluna da análise: as outras seguem
+            corpo.append(f"<p>Análise indisponível: coluna {html.escape(str(erro))} ausente.</p>")
+            continue
+        corpo += _secoes_html(nome, secoes, destino)
+
+    _gravar_pagina(destino, base, corpo)
+    return len(df), time.perf_counter() - inicio
+
+
+def _gravar_pagina(destino, base, corpo):
+    with open(os.path.join(destino, "index.html"), "w", encoding="utf-8") as pagina:
+        pagina.write(PAGINA.format(titulo=html.escape(base), plotly="../plotly.min.js", corpo="\n".join(corpo)))
+
+
+def _gravar_indice(saida, gerados):
+    itens = "\n".join(
+        f'<li><a href="{html.escape(base)}/index.html">{html.escape(base)}</a> ({linhas} tarefas)</li>'
+        for base, linhas in sorted(gerados)
+    )
+    with open(os.path.join(saida, "index.html"), "w", encoding="utf-8") as pagina:
+        pagina.write(PAGINA.format(titulo="Relatórios", plotly="plotly.min.js", corpo=f"<ul>\n{itens}\n</ul>"))
+
+
+def _gravar_plotly(saida):
+    from plotly.offline import get_plotlyjs
+
+    with open(os.path.join(saida, "plotly.min.js"), "w", encoding="utf-8") as arquivo:
+        arquivo.write(get_plotlyjs())
+
+
+def gerar(diretorio, saida, nomes=None, frequencia="M", processos=None, baixa_memoria=False):
+    """Relatórios de todas as exportações do diretório; devolve os que falharam."""
+    nomes = list(analises.ANALISES) if nomes is None else list(nomes)
+    caminhos = exportacoes(diretorio)
+    os.makedirs(saida, exist_ok=True)
+    _gravar_plotly(saida)
+
+    gerados, falhas = [], []
+    trabalhadores = max(1, min(len(caminhos), processos or os.cpu_count() or 1))
+    with ProcessPoolExecutor(trabalhadores, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futuros = {pool.submit(processar, c, saida, nomes, frequencia, baixa_memoria): c for c in caminhos}
+        for feitos, futuro in enumerate(as_completed(futuros), start=1):
+            caminho = futuros[futuro]
+            base = os.path.splitext(os.path.basename(caminho))[0]
+            try:
+                linhas, segundos = futuro.result()
+            except Exception as erro:
+                falhas.append(caminho)
+                print(f"[{feitos}/{len(caminhos)}] {caminho}: erro: {erro}", file=sys.stderr)
+                continue
+            gerados.append((base, linhas))
+            print(f"[{feitos}/{len(caminhos)}] {caminho}: {linhas} tarefas em {segundos:.1f} s")
+
+    _gravar_indice(saida, gerados)
+    return falhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("diretorio", help="diretório com as exportações (.xlsx)")
+    parser.add_argument("--saida", default="relatorios", help="diretório dos relatórios (padrão: relatorios)")
+    parser.add_argument(
+        "--analises", nargs="+", choices=list(analises.ANALISES),
+        help="análises incluídas (padrão: todas)",
+    )
+    parser.add_argument(
+        "--granularidade", choices=list(GRANULARIDADES), default="Mês",
+        help="período dos gráficos de tendência (padrão: Mês)",
+    )
+    parser.add_argument("--processos", type=int, help="processos em paralelo (padrão: um por CPU)")
+    parser.add_argument(
+        "--baixa-memoria", action="store_true",
+        help="lê cada planilha em blocos e gera só os agregados por equipe, pessoa e tipo",
+    )
+    args = parser.parse_args()
+
+    falhas = gerar(
+        args.diretorio, args.saida, args.analises, GRANULARIDADES[args.granularidade], args.processos,
+        args.baixa_memoria,
+    )
+    print(f"Relatórios gravados em {args.saida}")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
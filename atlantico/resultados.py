@@ -0,0 +1,43 @@
+"""Resultados das análises guardados por (arquivo, análise, parâmetros).
+
+Os agrupamentos dependem só do conteúdo do arquivo e de alguns valores de
+widgets (ex.: o slider de limite). Guardá-los faz com que alternar entre
+análises, ou voltar o slider a um valor já usado, não recalcule nada.
+Os valores devolvidos são compartilhados e não devem ser alterados.
+"""
+
+from atlantico.cache import CacheLRU
+from atlantico.perfil import etapa
+
+_resultados = CacheLRU(max_entradas=256, max_bytes=128 * 1024 * 1024)
+_AUSENTE = object()
+
+
+def memorizar(chave, analise, parametros, calcular):
+    """Devolve `calcular()`, calculado uma vez por (chave, analise, parametros)."""
+    item = (chave, analise, tuple(parametros))
+    valor = _resultados.get(item, _AUSENTE)
+    if valor is _AUSENTE:
+        with etapa(f"calculo.{analise}"):
+            valor = calcular()
+        _resultados.set(item, valor)
+    return valor
+
+
+def disponivel(chave, analise, parametros=()):
+    """True se o resultado já está calculado (sem calcular)."""
+    return (chave, analise, tuple(parametros)) in _resultados
+
+
+def descartar(chave):
+    """Remove os resultados do arquivo `chave` (e das janelas de período dele)."""
+    return _resultados.descartar(lambda item: deriva_de(item[0], chave))
+
+
+def deriva_de(chave_item, chave):
+    """True se `chave_item` é a chave do arquivo ou de uma janela dele."""
+    return isinstance(chave_item, str) and (chave_item == chave or chave_item.startswith(f"{chave}@"))
+
+
+def estatisticas():
+    return _resultados.estatisticas()
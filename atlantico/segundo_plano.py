@@ -0,0 +1,124 @@
+"""Leitura das planilhas em uma thread de fundo, com andamento na tela.
+
+Com um upload grande a página ficava em branco até o `read_excel`
+terminar, e cada clique nos botões enfileirava outra leitura. Agora a
+leitura roda num trabalhador do processo: o script mostra o progresso
+(e os cards com os números parciais) enquanto espera, e as reexecuções
+seguintes acompanham o mesmo trabalho pela chave, em vez de começar
+outro. A gravação no banco local (atlantico.armazem) usa os mesmos
+trabalhadores.
+
+Um trabalho que falhou continua registrado até alguém receber o erro
+(`aguardar` ou a próxima chamada de `iniciar` com a mesma chave); só
+depois disso a chave fica livre para uma nova tentativa.
+"""
+
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import pandas as pd
+import streamlit as st
+
+# Coluna usada nos cards resumo (menor/maior data)
+COLUNA_DATA = "Criada em"
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="atlantico-leitura")
+_trava = threading.RLock()
+# chave -> Trabalho em andamento (ou que falhou e ninguém viu o erro)
+_trabalhos = {}
+
+Trabalho = namedtuple("Trabalho", ["chave", "futuro", "andamento"])
+
+
+class Andamento:
+    """Progresso de um trabalho, atualizado pela thread de leitura."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.fracao = 0.0
+        self.texto = "Preparando a leitura…"
+        self.registros = 0
+        self.menor = pd.NaT
+        self.maior = pd.NaT
+
+    def etapa(self, texto, fracao=None):
+        with self._trava:
+            self.texto = texto
+            if fracao is not None:
+                self.fracao = min(max(fracao, 0.0), 1.0)
+
+    def linhas(self, df):
+        """Soma as linhas já lidas aos números parciais dos cards."""
+        datas = df[COLUNA_DATA] if COLUNA_DATA in df.columns else None
+        menor = datas.min() if datas is not None else pd.NaT
+        maior = datas.max() if datas is not None else pd.NaT
+        with self._trava:
+            self.registros += len(df)
+            if pd.notnull(menor) and (pd.isnull(self.menor) or menor < self.menor):
+                self.menor = menor
+            if pd.notnull(maior) and (pd.isnull(self.maior) or maior > self.maior):
+                self.maior = maior
+
+    def tabela(self, tabela):
+        """Como `linhas`, para uma tabela Arrow (só a coluna de data vira pandas)."""
+        if COLUNA_DATA in tabela.column_names:
+            self.linhas(tabela.select([COLUNA_DATA]).to_pandas())
+        else:
+            self.linhas(pd.DataFrame(index=range(tabela.num_rows)))
+
+
+def _remover(trabalho):
+    with _trava:
+        if _trabalhos.get(trabalho.chave) is trabalho:
+            del _trabalhos[trabalho.chave]
+
+
+def _concluido(trabalho):
+    # Com erro, fica registrado para a próxima reexecução relançá-lo
+    if trabalho.futuro.cancelled() or trabalho.futuro.exception() is None:
+        _remover(trabalho)
+
+
+def iniciar(chave, funcao):
+    """Trabalho em andamento para a chave, ou um novo rodando `funcao(andamento)`.
+
+    Se o último trabalho da chave falhou, ele é devolvido (uma vez) para
+    quem chamou relançar o erro com `futuro.result()`.
+    """
+    with _trava:
+        trabalho = _trabalhos.get(chave)
+        if trabalho is not None and trabalho.futuro.done():
+            _remover(trabalho)
+        elif trabalho is None:
+            andamento = Andamento()
+            trabalho = Trabalho(chave, _executor.submit(funcao, andamento), andamento)
+            _trabalhos[chave] = trabalho
+            # Quem já espera guarda o Trabalho; a chave fica livre para a próxima vez
+            trabalho.futuro.add_done_callback(lambda _: _concluido(trabalho))
+    return trabalho
+
+
+def aguardar(trabalho, desenhar, intervalo=0.25):
+    """Espera o trabalho chamando `desenhar(andamento)` a cada `intervalo`.
+
+    Nada é desenhado se o trabalho termina antes do primeiro intervalo
+    (ex.: dados já no sidecar). Erros da leitura são relançados aqui.
+    """
+    espaco = None
+    try:
+        while True:
+            try:
+                return trabalho.futuro.result(timeout=intervalo)
+            except TimeoutError:
+                if espaco is None:
+                    espaco = st.empty()
+                with espaco.container():
+                    desenhar(trabalho.andamento)
+            except Exception:
+                # Erro entregue: a próxima reexecução tenta de novo
+                _remover(trabalho)
+                raise
+    finally:
+        if espaco is not None:
+            espaco.empty()
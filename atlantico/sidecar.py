@@ -0,0 +1,158 @@
+"""Cópia colunar das planilhas em disco, no formato Arrow IPC.
+
+O .xlsx é convertido uma única vez; reexecuções, novas sessões e os outros
+dashboards leem o arquivo .arrow por memory-map, sem passar pelo openpyxl.
+"""
+
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from atlantico.esquema import ESQUEMA, texto_ou_nulo
+
+# String vazia desliga a cópia em disco
+DIRETORIO = os.environ.get(
+    "ATLANTICO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "atlantico")
+)
+MAX_BYTES_DIRETORIO = 2 * 1024 * 1024 * 1024
+
+# Metadado com o cabeçalho completo da planilha, já que a cópia em disco
+# pode guardar só parte das colunas
+CHAVE_CABECALHO = b"atlantico.cabecalho"
+# Metadado com a memória do DataFrame antes/depois da tipagem compacta
+CHAVE_MEMORIA = b"atlantico.memoria"
+# Metadado com as datas que não puderam ser convertidas, por coluna
+CHAVE_DATAS_INVALIDAS = b"atlantico.datas_invalidas"
+
+
+def caminho(chave):
+    return os.path.join(DIRETORIO, f"{chave}.arrow")
+
+
+def para_arrow(df, cabecalho):
+    """Converte o DataFrame tipado em uma tabela Arrow.
+
+    Colunas fora do ESQUEMA com tipos misturados (número e texto na mesma
+    coluna) viram texto, já que o Arrow exige um único tipo por coluna.
+    """
+    arrays = []
+    for nome in df.columns:
+        serie = df[nome]
+        try:
+            arrays.append(pa.Array.from_pandas(serie, type=ESQUEMA.get(nome)))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.Array.from_pandas(texto_ou_nulo(serie), type=pa.string()))
+    tabela = pa.Table.from_arrays(arrays, names=[str(nome) for nome in df.columns])
+    return tabela.replace_schema_metadata({CHAVE_CABECALHO: json.dumps(cabecalho).encode()})
+
+
+def anotar_memoria(tabela, antes, depois):
+    """Registra nos metadados a memória ocupada antes/depois da tipagem."""
+    metadados = dict(tabela.schema.metadata or {})
+    metadados[CHAVE_MEMORIA] = json.dumps([antes, depois]).encode()
+    return tabela.replace_schema_metadata(metadados)
+
+
+def anotar_datas_invalidas(tabela, invalidas):
+    """Registra nos metadados as datas não reconhecidas, por coluna."""
+    metadados = dict(tabela.schema.metadata or {})
+    metadados[CHAVE_DATAS_INVALIDAS] = json.dumps(invalidas).encode()
+    return tabela.replace_schema_metadata(metadados)
+
+
+def para_pandas(tabela):
+    """DataFrame da tabela, com booleanos anuláveis em vez de objeto."""
+    return tabela.to_pandas(types_mapper={pa.bool_(): pd.BooleanDtype()}.get)
+
+
+def ler_esquema(chave):
+    """Esquema da cópia em disco (sem ler os dados), ou None."""
+    if not DIRETORIO:
+        return None
+    try:
+        with pa.memory_map(caminho(chave)) as origem:
+            return pa.ipc.open_file(origem).schema
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def cabecalho(esquema):
+    return json.loads(esquema.metadata[CHAVE_CABECALHO])
+
+
+def memoria(esquema):
+    """(bytes antes, bytes depois) da tipagem, ou None."""
+    valor = (esquema.metadata or {}).get(CHAVE_MEMORIA)
+    return tuple(json.loads(valor)) if valor else None
+
+
+def datas_invalidas(esquema):
+    """{coluna: datas não reconhecidas}, ou None."""
+    valor = (esquema.metadata or {}).get(CHAVE_DATAS_INVALIDAS)
+    return json.loads(valor) if valor else None
+
+
+def ler(chave, colunas=None):
+    """Devolve a tabela guardada para a chave, ou None se não existir."""
+    if not DIRETORIO:
+        return None
+    try:
+        return feather.read_table(caminho(chave), columns=colunas, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def substituir(destino, gravar):
+    """Grava `destino` de uma vez: `gravar(temporario)` e troca o arquivo.
+
+    O temporário fica no mesmo diretório e é apagado se algo falhar.
+    """
+    diretorio = os.path.dirname(destino)
+    os.makedirs(diretorio, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=diretorio, suffix=".tmp")
+    os.close(fd)
+    try:
+        gravar(temporario)
+        # os.replace é atômico: outra sessão nunca lê um arquivo pela metade
+        os.replace(temporario, destino)
+    except BaseException:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        raise
+
+
+def gravar(chave, tabela):
+    """Grava a tabela sem compressão (requisito para o memory-map sem cópia)."""
+    if not DIRETORIO:
+        return
+    try:
+        substituir(
+            caminho(chave), lambda temporario: feather.write_feather(tabela, temporario, compression="uncompressed")
+        )
+    except OSError:
+        return
+    limpar_antigos()
+
+
+def limpar_antigos(max_bytes=MAX_BYTES_DIRETORIO):
+    """Remove as cópias acessadas há mais tempo até caber no limite."""
+    try:
+        arquivos = [
+            os.path.join(DIRETORIO, nome)
+            for nome in os.listdir(DIRETORIO)
+            if nome.endswith(".arrow")
+        ]
+        arquivos.sort(key=os.path.getatime)
+        total = sum(os.path.getsize(a) for a in arquivos)
+        while arquivos and total > max_bytes:
+            antigo = arquivos.pop(0)
+            total -= os.path.getsize(antigo)
+            os.remove(antigo)
+    except OSError:
+        pass
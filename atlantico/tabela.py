@@ -0,0 +1,66 @@
+"""Tabela paginada no servidor para os DataFrames de detalhe.
+
+Com "(todas)" selecionado as tabelas de detalhe podem ter centenas de
+milhares de linhas. Aqui o filtro e a ordenação são feitos no servidor e
+só a página visível é serializada e enviada ao navegador.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from atlantico.perfil import etapa
+from atlantico.resultados import memorizar
+
+TAMANHOS_PAGINA = [50, 100, 500]
+ORDEM_PADRAO = "(padrão)"
+
+
+def filtrar(df, texto):
+    """Posições das linhas que contêm `texto` em alguma coluna de texto."""
+    texto = texto.strip()
+    if not texto:
+        return np.arange(len(df))
+    encontrado = np.zeros(len(df), dtype=bool)
+    for coluna in df.columns:
+        serie = df[coluna]
+        if serie.dtype == object or isinstance(serie.dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            encontrado |= serie.astype(str).str.contains(texto, case=False, regex=False).to_numpy()
+    return np.flatnonzero(encontrado)
+
+
+def ordenar(df, posicoes, coluna, crescente):
+    """Reordena `posicoes` pelos valores de `coluna` (vazios por último)."""
+    if coluna == ORDEM_PADRAO:
+        return posicoes if crescente else posicoes[::-1]
+    valores = pd.Series(df[coluna].to_numpy()[posicoes])
+    ordem = valores.sort_values(ascending=crescente, na_position="last").index.to_numpy()
+    return posicoes[ordem]
+
+
+def tabela_paginada(df, chave, nome, parametros=()):
+    """Mostra `df` página a página.
+
+    `nome` identifica a tabela (e os widgets dela); junto com `chave` e
+    `parametros` deve determinar o conteúdo de `df`, pois a ordem filtrada
+    é guardada em cache por essa combinação.
+    """
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    texto = col1.text_input("Filtrar", key=f"{nome}.filtro", placeholder="Texto em qualquer coluna")
+    coluna = col2.selectbox("Ordenar por", [ORDEM_PADRAO] + [str(c) for c in df.columns], key=f"{nome}.ordem")
+    crescente = col3.selectbox("Sentido", ["↑", "↓"], key=f"{nome}.sentido") == "↑"
+    por_pagina = col4.selectbox("Linhas", TAMANHOS_PAGINA, index=1, key=f"{nome}.linhas")
+
+    posicoes = memorizar(
+        chave, f"tabela.{nome}", (*parametros, texto, coluna, crescente),
+        lambda: ordenar(df, filtrar(df, texto), coluna, crescente),
+    )
+
+    total_paginas = max(1, -(-len(posicoes) // por_pagina))
+    pagina = st.number_input("Página", min_value=1, value=1, step=1, key=f"{nome}.pagina")
+    pagina = min(int(pagina), total_paginas)
+
+    inicio = (pagina - 1) * por_pagina
+    with etapa(f"dataframe.{nome}"):
+        st.dataframe(df.iloc[posicoes[inicio:inicio + por_pagina]], use_container_width=True)
+    st.caption(f"{len(posicoes)} de {len(df)} linhas — página {pagina} de {total_paginas}")
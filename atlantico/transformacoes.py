@@ -0,0 +1,69 @@
+"""Transformações compartilhadas entre as análises."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from atlantico.perfil import medir
+
+
+def _itens_por_valor(valores):
+    """(itens por valor, código de cada item em sequência, nomes dos itens).
+
+    Itens das listas separadas por vírgulas, sem espaços nas pontas e sem
+    itens vazios; um valor sem nenhum item fica com um único item nulo
+    (código -1). A separação, o corte dos espaços e a codificação dos
+    itens rodam no pyarrow, sem laço Python por item.
+    """
+    if pd.api.types.infer_dtype(valores, skipna=False) != "string":
+        valores = list(map(str, valores))
+    listas = pc.split_pattern(pa.array(valores, type=pa.string()), ",")
+    por_valor = pc.list_value_length(listas).to_numpy(zero_copy_only=False).astype(np.int64)
+    pedacos = pc.utf8_trim_whitespace(pc.list_flatten(listas))
+    manter = pc.not_equal(pedacos, "").to_numpy(zero_copy_only=False).copy()
+    codificados = pedacos.dictionary_encode()
+    codigos = codificados.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+
+    valor_do_pedaco = np.repeat(np.arange(len(por_valor)), por_valor)
+    contagens = np.bincount(valor_do_pedaco[manter], minlength=len(por_valor))
+    # Sem item: o primeiro pedaço do valor fica, como nulo
+    sem_itens = (np.cumsum(por_valor) - por_valor)[contagens == 0]
+    manter[sem_itens] = True
+    codigos[sem_itens] = -1
+    return np.maximum(contagens, 1), codigos[manter], codificados.dictionary.to_numpy(zero_copy_only=False)
+
+
+@medir("explode")
+def explodir_multivalorado(df, coluna, destino):
+    """Uma linha por item da lista separada por vírgulas em `coluna`.
+
+    Equivale a `df.explode` sobre as listas de itens (sem espaços e sem
+    itens vazios): linhas sem nenhum item aparecem uma vez com `destino`
+    nulo e o índice original é mantido. A separação é feita uma vez para
+    os valores distintos da coluna e expandida com numpy, sem laço por
+    linha. O custo fixo por linha (fatorar a coluna e copiar as linhas
+    de `df`) não muda; o da separação cresce com o número de valores
+    distintos. Por isso o ganho sobre o `apply` + `explode` depende de
+    quantas listas se repetem e de quantas colunas `df` carrega.
+    """
+    n = len(df)
+    codigos, unicos = pd.factorize(df[coluna])  # vazio -> -1
+
+    contagens, itens, nomes = _itens_por_valor(unicos)
+    # Posição extra no fim, com um item nulo: o código -1 (célula vazia) cai nela
+    tamanhos = np.append(contagens, 1)
+    inicios = np.cumsum(tamanhos) - tamanhos
+    plano = np.append(itens, -1)
+    # Código de item -1 -> último nome, o nulo
+    nomes = np.append(nomes, np.array([np.nan], dtype=object))
+
+    repeticoes = tamanhos[codigos]
+    linhas = np.repeat(np.arange(n), repeticoes)
+    # Saída j da linha i: item inicios[codigo de i] + (j - primeira saída de i)
+    primeira = np.cumsum(repeticoes) - repeticoes
+    origem = np.repeat(inicios[codigos] - primeira, repeticoes) + np.arange(len(linhas))
+
+    resultado = df.take(linhas)
+    resultado[destino] = nomes[plano[origem]]
+    return resultado
@@ -0,0 +1,47 @@
+"""Componentes visuais comuns aos dashboards."""
+
+import streamlit as st
+import pandas as pd
+
+
+# ----------------------------------------------
+# FUNÇÃO PARA MOSTRAR UM CARD
+# ----------------------------------------------
+def card(title, value, icon="📄"):
+    st.markdown(
+        f"""
+        <div style="
+            background-color:#f5f7fa;padding:18px;border-radius:12px;
+            box-shadow:0 2px 6px rgba(0,0,0,0.08);text-align:center;
+            border-left:5px solid #4a90e2;min-height:90px;">
+            <div style="font-size:26px;">{icon}</div>
+            <div style="color:#555;font-size:15px;">{title}</div>
+            <div style="font-size:22px;font-weight:700;">{value}</div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+# ----------------------------------------------
+# CARDS RESUMO
+# ----------------------------------------------
+def cards_resumo(df):
+    cards(len(df), df["Criada em"].min(), df["Criada em"].max())
+
+
+def cards(total, menor, maior):
+    col1, col2, col3 = st.columns(3)
+
+    with col1: card("Total de Registros", total, "📄")
+    with col2: card("Menor Data", menor.strftime("%d/%m/%Y") if pd.notnull(menor) else "-", "📅")
+    with col3: card("Maior Data", maior.strftime("%d/%m/%Y") if pd.notnull(maior) else "-", "📆")
+
+
+# ----------------------------------------------
+# LEITURA EM ANDAMENTO (progresso + cards parciais)
+# ----------------------------------------------
+def cards_andamento(andamento):
+    st.progress(andamento.fracao, text=andamento.texto)
+    if andamento.registros:
+        cards(f"{andamento.registros:,}+".replace(",", "."), andamento.menor, andamento.maior)
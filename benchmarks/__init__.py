@@ -0,0 +1 @@
+"""Benchmarks dos dashboards (ver benchmarks/executar.py)."""
@@ -0,0 +1,46 @@
+"""Compara dois resultados de benchmarks/executar.py e aponta regressões.
+
+    python -m benchmarks.comparar base.json novo.json --tolerancia 0.2
+
+Sai com código 1 se alguma etapa ficou mais lenta que a tolerância.
+"""
+
+import argparse
+import json
+import sys
+
+
+def carregar(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    return {(r["linhas"], r["analise"], r["etapa"]): r["segundos"] for r in dados["resultados"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("novo")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="aumento relativo aceito (0.2 = 20%%)")
+    parser.add_argument(
+        "--minimo-ms", type=float, default=5.0,
+        help="etapas abaixo disso na base são ignoradas (ruído de medição)",
+    )
+    args = parser.parse_args()
+
+    base, novo = carregar(args.base), carregar(args.novo)
+    regressoes = 0
+    for item in sorted(base.keys() & novo.keys()):
+        antes, depois = base[item], novo[item]
+        razao = depois / antes if antes else float("inf")
+        marca = ""
+        if antes * 1000 >= args.minimo_ms and razao > 1 + args.tolerancia:
+            marca = "  <-- regressão"
+            regressoes += 1
+        linhas, analise, etapa = item
+        print(f"{linhas:>9} {analise:<13} {etapa:<10} {antes * 1000:9.1f} -> {depois * 1000:9.1f} ms  x{razao:5.2f}{marca}")
+
+    sys.exit(1 if regressoes else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Mede cada etapa das quatro análises sobre exportações sintéticas.
+
+Etapas: leitura do .xlsx, coerção de tipos/datas, explode das listas,
+agrupamentos, construção das figuras e serialização das tabelas (o que o
+`st.dataframe` envia ao navegador). Roda sem o runtime do Streamlit e
+grava um JSON que pode ser comparado com benchmarks/comparar.py.
+
+    python -m benchmarks.executar --linhas 10000 100000 1000000
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from atlantico.analises import percentual, reabertas, tempo, tempo_tarefa
+from atlantico.esquema import tipar_colunas
+from atlantico.indice import IndiceAtribuicao
+from benchmarks.gerar_exportacao import gerar, salvar_xlsx
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+
+def cronometrar(funcao, repeticoes):
+    """Menor tempo entre as repetições e o resultado da última."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def serializar(df):
+    """Bytes que o st.dataframe enviaria (Arrow IPC do DataFrame)."""
+    tabela = pa.Table.from_pandas(df.astype({c: str for c in df.columns if df[c].dtype == object}))
+    destino = io.BytesIO()
+    with pa.ipc.new_stream(destino, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return destino.getbuffer().nbytes
+
+
+def etapas_reabertas(df):
+    df_r = reabertas.reabertas_por_responsavel(df)
+    indice = IndiceAtribuicao.construir(df_r["Responsavel"])
+    cont = reabertas.contagem_reaberta(df)
+    agrup = reabertas.reaberturas_por_responsavel(indice)
+    tabela = df_r[["Tarefa", "Responsavel", "Criada em", "Reaberta?"]].sort_values("Criada em", ascending=False)
+    return [
+        ("explode", lambda: reabertas.reabertas_por_responsavel(df)),
+        ("indice", lambda: IndiceAtribuicao.construir(df_r["Responsavel"])),
+        ("groupby", lambda: (reabertas.contagem_reaberta(df), reabertas.reaberturas_por_responsavel(indice))),
+        ("figuras", lambda: (reabertas.grafico_pizza(cont), reabertas.grafico_responsaveis(agrup))),
+        ("tabela", lambda: serializar(tabela)),
+    ]
+
+
+def etapas_tempo(df):
+    df_valid = tempo.preparar_tempo(df)
+    media = tempo.media_por_equipe(df_valid)
+    atraso = tempo.atraso_por_equipe(df_valid)
+    return [
+        ("explode", lambda: tempo.preparar_tempo(df)),
+        ("groupby", lambda: (tempo.media_por_equipe(df_valid), tempo.atraso_por_equipe(df_valid))),
+        ("figuras", lambda: (tempo.grafico_media(media), tempo.grafico_atraso(atraso))),
+        ("tabela", lambda: serializar(df_valid.sort_values("tempo_dias", ascending=False))),
+    ]
+
+
+def etapas_percentual(df):
+    df_val = percentual.registros_validos(df)
+    menor = percentual.percentuais_ate(df_val, 20)
+    maior = percentual.percentuais_acima_de_100(df_val)
+    return [
+        ("groupby", lambda: (
+            percentual.registros_validos(df),
+            percentual.percentuais_ate(df_val, 20),
+            percentual.percentuais_acima_de_100(df_val),
+        )),
+        ("tabela", lambda: (serializar(menor), serializar(maior))),
+    ]
+
+
+def etapas_tempo_tarefa(df):
+    df_temp = tempo_tarefa.registros_com_tempo(df)
+    total = tempo_tarefa.tempo_por_tipo(df_temp, "sum")
+    media = tempo_tarefa.tempo_por_tipo(df_temp, "mean")
+    return [
+        ("groupby", lambda: (
+            tempo_tarefa.registros_com_tempo(df),
+            tempo_tarefa.tempo_por_tipo(df_temp, "sum"),
+            tempo_tarefa.tempo_por_tipo(df_temp, "mean"),
+        )),
+        ("figuras", lambda: (
+            tempo_tarefa.grafico_por_tipo(total, rotulo="Tempo Total (h)"),
+            tempo_tarefa.grafico_por_tipo(media, rotulo="Tempo Médio (h)"),
+        )),
+        ("tabela", lambda: serializar(tempo_tarefa.tabela_por_tipo(df_temp, "(Todas)"))),
+    ]
+
+
+ANALISES = {
+    "reabertas": etapas_reabertas,
+    "tempo": etapas_tempo,
+    "percentual": etapas_percentual,
+    "tempo_tarefa": etapas_tempo_tarefa,
+}
+
+
+def medir(linhas, repeticoes, max_linhas_excel, semente=0):
+    resultados = []
+
+    def registrar(analise, etapa, segundos):
+        resultados.append({"linhas": linhas, "analise": analise, "etapa": etapa, "segundos": segundos})
+        print(f"{linhas:>9} {analise:<13} {etapa:<10} {segundos * 1000:10.1f} ms", flush=True)
+
+    bruto = gerar(linhas, semente)
+
+    if linhas <= max_linhas_excel:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "tarefas.xlsx")
+            salvar_xlsx(bruto, caminho)
+            with open(caminho, "rb") as arquivo:
+                dados = arquivo.read()
+        segundos, bruto = cronometrar(lambda: pd.read_excel(io.BytesIO(dados)), 1)
+        registrar("comum", "leitura", segundos)
+
+    segundos, df = cronometrar(lambda: tipar_colunas(bruto.copy()), repeticoes)
+    registrar("comum", "coercao", segundos)
+
+    for analise, montar in ANALISES.items():
+        for etapa, funcao in montar(df):
+            segundos, _ = cronometrar(funcao, repeticoes)
+            registrar(analise, etapa, segundos)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument(
+        "--max-linhas-excel", type=int, default=100_000,
+        help="acima disso a etapa de leitura do .xlsx é pulada (gravar 1M de linhas leva minutos)",
+    )
+    parser.add_argument("--saida", help="arquivo JSON (padrão: benchmarks/resultados/<data>.json)")
+    args = parser.parse_args()
+
+    resultados = []
+    for linhas in args.linhas:
+        resultados += medir(linhas, args.repeticoes, args.max_linhas_excel)
+
+    agora = datetime.datetime.now()
+    saida = args.saida or os.path.join(DIRETORIO_RESULTADOS, f"{agora:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump({
+            "data": agora.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "repeticoes": args.repeticoes,
+            "resultados": resultados,
+        }, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {saida}")
+
+
+if __name__ == "__main__":
+    main()
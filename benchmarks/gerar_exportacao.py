@@ -0,0 +1,107 @@
+"""Gera exportações sintéticas de tarefas com distribuições realistas.
+
+As colunas usadas pelos dashboards ficam nas mesmas posições da exportação
+real (Tarefa na 9, Para na 11, Criada em na 15, Reaberta? na 27) e trazem
+os mesmos problemas: listas "Para"/"Equipe" separadas por vírgula, datas
+vazias e textos no meio das colunas numéricas.
+
+    python -m benchmarks.gerar_exportacao 100000 /tmp/tarefas.xlsx
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+TOTAL_COLUNAS = 30
+POSICOES = {
+    0: "ID da Tarefa",
+    2: "Tipo de tarefa",
+    5: "Equipe",
+    6: "Fechada em",
+    7: "Entrega desejada",
+    9: "Tarefa",
+    11: "Para",
+    15: "Criada em",
+    18: "Já registradas h",
+    19: "%",
+    20: "Esforço estimado h",
+    27: "Reaberta?",
+}
+
+TIPOS = ["Bug", "Melhoria", "Suporte", "Dúvida", "Implantação", "Relatório", "Integração"]
+EQUIPES = ["Desenvolvimento", "QA", "Suporte N1", "Suporte N2", "Infra", "Dados", "Produto"]
+LIXO_NUMERICO = ["n/d", "-", "", "1,5", "?"]
+
+
+def _listas(rng, nomes, n, max_itens, vazio):
+    """Listas "a, b" com nomes em distribuição de Zipf (poucos concentram)."""
+    pesos = 1 / np.arange(1, len(nomes) + 1)
+    pesos /= pesos.sum()
+    tamanhos = rng.integers(1, max_itens + 1, n)
+    tamanhos[rng.random(n) < vazio] = 0
+    sorteados = rng.choice(len(nomes), size=(n, max_itens), p=pesos)
+    return [
+        ", ".join(dict.fromkeys(nomes[i] for i in sorteados[linha, :tamanho]))
+        for linha, tamanho in enumerate(tamanhos)
+    ]
+
+
+def _com_lixo(rng, valores, proporcao):
+    valores = valores.astype(object)
+    lixo = rng.random(len(valores)) < proporcao
+    valores[lixo] = rng.choice(LIXO_NUMERICO, lixo.sum())
+    return valores
+
+
+def gerar(linhas, semente=0, pessoas=120):
+    """DataFrame no formato devolvido pelo `pd.read_excel` da exportação."""
+    rng = np.random.default_rng(semente)
+    nomes = [f"Pessoa {i:03d}" for i in range(pessoas)]
+
+    criada = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 730 * 24, linhas), unit="h")
+    entrega = criada + pd.to_timedelta(rng.integers(24, 24 * 45, linhas), unit="h")
+    fechada = entrega + pd.to_timedelta(rng.normal(0, 96, linhas).round(), unit="h")
+
+    colunas = {
+        "ID da Tarefa": np.arange(1, linhas + 1),
+        "Tipo de tarefa": rng.choice(TIPOS, linhas, p=[0.3, 0.25, 0.2, 0.1, 0.06, 0.05, 0.04]),
+        "Equipe": _listas(rng, EQUIPES, linhas, 2, vazio=0.05),
+        "Fechada em": pd.Series(fechada).where(rng.random(linhas) > 0.15),
+        "Entrega desejada": pd.Series(entrega).where(rng.random(linhas) > 0.05),
+        "Tarefa": [f"Tarefa {i}" for i in range(linhas)],
+        "Para": _listas(rng, nomes, linhas, 3, vazio=0.02),
+        "Criada em": pd.Series(criada).where(rng.random(linhas) > 0.01),
+        "Já registradas h": _com_lixo(rng, rng.gamma(1.5, 6, linhas).round(2), 0.03),
+        "%": _com_lixo(rng, rng.lognormal(-0.2, 0.6, linhas).round(3), 0.03),
+        "Esforço estimado h": rng.integers(1, 80, linhas),
+        "Reaberta?": rng.choice(["Sim", "Não"], linhas, p=[0.15, 0.85]),
+    }
+    df = pd.DataFrame({
+        POSICOES.get(i, f"Campo {i}"): colunas.get(POSICOES.get(i), f"valor {i}")
+        for i in range(TOTAL_COLUNAS)
+    })
+    for coluna in ["Tipo de tarefa", "Equipe", "Para"]:
+        df[coluna] = df[coluna].replace("", np.nan)
+    return df
+
+
+def salvar_xlsx(df, caminho):
+    """Grava com o openpyxl em modo write-only (bem mais rápido que to_excel)."""
+    livro = Workbook(write_only=True)
+    planilha = livro.create_sheet()
+    planilha.append(list(df.columns))
+    valores = df.astype(object).where(df.notna(), None)
+    for linha in valores.itertuples(index=False):
+        planilha.append(linha)
+    livro.save(caminho)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("linhas", type=int)
+    parser.add_argument("caminho")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+    salvar_xlsx(gerar(args.linhas, args.semente), args.caminho)